@@ -18,13 +18,13 @@ def respond(prompt: str) -> str:
 
     # Detect teachability prompts coming from brain.py
     if "source of truth:" in lower:
-        return _respond_with_teaching(text)
+        return _respond_with_teaching(text, lower)
 
     # Otherwise, fallback
     return _basic_response(text)
 
 
-def _respond_with_teaching(prompt: str) -> str:
+def _respond_with_teaching(prompt: str, lower: str) -> str:
     """
     Prompt looks roughly like:
 
@@ -38,8 +38,8 @@ def _respond_with_teaching(prompt: str) -> str:
         User: <question>
 
     We want to grab <canonical explanation> and build a clear answer from it.
+    `lower` is prompt.lower(), already computed by respond().
     """
-    lower = prompt.lower()
     marker = "source of truth:"
     idx = lower.find(marker)
     if idx == -1:
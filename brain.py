@@ -33,14 +33,25 @@ def _ms_bytes_look_like_pdf(b: bytes) -> bool:
 
 import os
 import re
+import atexit
+import bisect
 import sys
+import copy
+import codecs
+import contextlib
 import json
 import time
 import shutil
 import signal
 import difflib
+import heapq
+import functools
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import datetime
 import html as html_lib
+from dataclasses import dataclass
 from typing import Dict, Any, List, Tuple, Optional
 
 try:
@@ -49,6 +60,43 @@ try:
 except Exception:
     urllib = None
 
+# Optional multi-pattern matcher for page block markers (falls back to substring checks)
+try:
+    import ahocorasick  # type: ignore
+except Exception:
+    ahocorasick = None
+
+# Optional fast JSON (falls back to stdlib json)
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+def _json_dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # orjson.JSONEncodeError subclasses TypeError
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+def _json_line(obj: Any) -> bytes:
+    # one compact JSON document per line (JSONL logs)
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass  # orjson.JSONEncodeError subclasses TypeError
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+def _json_loads(data: Any) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            pass  # orjson.JSONDecodeError subclasses ValueError (NaN etc. fall back)
+    return json.loads(data)
+
 APP_NAME = "Machine Spirit"
 
 # -----------------------------
@@ -73,6 +121,11 @@ PENDING_PATH = os.path.join(DATA_DIR, "pending_promotions.json")
 
 AUTONOMY_PATH = os.path.join(DATA_DIR, "autonomy.json")
 
+WIKI_CACHE_PATH = os.path.join(DATA_DIR, "wiki_cache.json")
+WIKI_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60  # 7 days
+WEB_CACHE_PATH = os.path.join(DATA_DIR, "web_cache.json")
+WEB_CACHE_TTL_SECONDS = 6 * 60 * 60  # 6 hours
+
 LOGS_DIR = os.path.join(DATA_DIR, "logs")
 EXPORTS_DIR = os.path.join(DATA_DIR, "exports")
 BACKUPS_DIR = os.path.join(DATA_DIR, "backups")
@@ -83,6 +136,9 @@ BRAIN_LOG = os.path.join(LOGS_DIR, "brain.log")
 AUTONOMY_LOG = os.path.join(LOGS_DIR, "autonomy.log")
 
 DEFAULT_MAX_QUEUE_ATTEMPTS = 3
+# cap on concurrent /webqueue fetches; a large /webqueue N shouldn't open N connections
+# to DDG at once
+WEBQUEUE_MAX_WORKERS = 8
 DEFAULT_COOLDOWN_SECONDS = 6 * 60 * 60  # 6 hours
 
 # MS_FORCED_RFC_MAP_V1
@@ -206,6 +262,12 @@ def _rfc_clean_answer(answer: str) -> str:
 
 # RFC plain-text summarizer helpers (keeps answers clean)
 
+RFC_NORM_BAD = re.compile(
+    r'(ISSN:|Status of This Memo|Copyright|Table of Contents|Author\'?s Address'
+    r'|Authors\'? Addresses|Obsoletes:|Updates:|Network Working Group|Request for Comments:)',
+    re.I,
+)
+RFC_SECTION_HEAD = re.compile(r'^\d+\.\s+')
 RFC_SKIP_SENT = re.compile(r'(\bISSN\b|RFC Series|Status of This Memo|Network Working Group|Internet Society|Copyright|STD\s*1)', re.I)
 
 def _is_rfc_txt_url(url: str) -> bool:
@@ -215,14 +277,13 @@ def _is_rfc_txt_url(url: str) -> bool:
 def _rfc_norm_lines(raw: str):
     raw = (raw or '').replace('\x0c', '\n')
     ls = [x.rstrip() for x in raw.splitlines()]
-    bad = re.compile(r'(ISSN:|Status of This Memo|Copyright|Table of Contents|Author\'?s Address|Authors\'? Addresses|Obsoletes:|Updates:|Network Working Group|Request for Comments:)', re.I)
     out = []
     for L in ls:
         t = L.strip()
         if not t:
             out.append('')
             continue
-        if bad.search(t):
+        if RFC_NORM_BAD.search(t):
             continue
         out.append(L)
     # collapse multiple blanks
@@ -254,20 +315,20 @@ def _rfc_take_until_next_section(lines, start_i: int, max_lines: int = 220):
             if buf:
                 buf.append('')
             continue
-        if re.match(r'^\d+\.\s+', t) and not t.lower().startswith('1. introduction'):
+        if RFC_SECTION_HEAD.match(t) and not t.lower().startswith('1. introduction'):
             break
         if t.lower() in ('status of this memo', 'copyright notice'):
             break
         buf.append(t)
     txt = ' '.join(x for x in buf if x != '').strip()
-    txt = re.sub(r'\s+', ' ', txt)
+    txt = _RE_WS.sub(' ', txt)
     return txt
 
 def _sentences(text: str):
-    text = re.sub(r'\s+', ' ', (text or '').strip())
+    text = _RE_WS.sub(' ', (text or '').strip())
     if not text:
         return []
-    parts = re.split(r'(?<=[\.\!\?])\s+', text)
+    parts = split_sentences(text)
     out = []
     for s in parts:
         s = s.strip()
@@ -390,6 +451,17 @@ AUTH_BUCKET_BONUS: Dict[str, float] = {
     "wiki": 0.03,        # wikipedia (allowed but small)
 }
 
+# bucket presence as a bitmask -> precomputed bonus sum (same summation order as the dict)
+_BUCKET_IDX: Dict[str, int] = {name: 1 << i for i, name in enumerate(AUTH_BUCKET_BONUS)}
+_BONUS_TABLE: List[float] = []
+for _mask in range(1 << len(AUTH_BUCKET_BONUS)):
+    _sum = 0.0
+    for _name, _bonus in AUTH_BUCKET_BONUS.items():
+        if _mask & _BUCKET_IDX[_name]:
+            _sum += float(_bonus)
+    _BONUS_TABLE.append(_sum)
+del _mask, _sum, _name, _bonus
+
 REINFORCE_DAYS = 7
 REINFORCE_BONUS_PER_HIT = 0.02
 REINFORCE_BONUS_CAP = 0.10
@@ -399,6 +471,166 @@ INDEPENDENT_DOMAIN_BONUS_CAP = 0.12
 
 HIGH_AUTH_BUCKETS = {"rfc", "nist", "standards", "gov", "edu"}
 
+# -----------------------------
+# Precompiled patterns (hot paths: topic checks + HTML scraping)
+# -----------------------------
+_RE_WS = re.compile(r"\s+")
+
+_URLISH_PATTERNS = [
+    re.compile(r"^(https?://)", re.IGNORECASE),
+    re.compile(r"\bwww\.", re.IGNORECASE),
+    re.compile(r"\b[a-z0-9-]+\.[a-z]{2,}\b", re.IGNORECASE),
+]
+
+_HTML_SCRIPT = re.compile(r"<(script|style).*?>.*?</\1>", re.IGNORECASE | re.DOTALL)
+_HTML_TAG = re.compile(r"<.*?>", re.DOTALL)
+
+# scraping / synthesis
+_RE_SENT_BREAK = re.compile(r"[.!?]\s+")
+_RE_CHUNK_SPLIT = re.compile(r"[\n\r]+|(?<=[\.\!\?])\s+")
+_RE_NEWLINES = re.compile(r"[\n\r]+")
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split after . ! or ? followed by whitespace (the whitespace is dropped).
+    Same pieces as the old lookbehind re.split, found with a forward scan for
+    punctuation + whitespace instead of a lookbehind tried at every offset.
+    """
+    out: List[str] = []
+    start = 0
+    for m in _RE_SENT_BREAK.finditer(text):
+        out.append(text[start:m.start() + 1])
+        start = m.end()
+    out.append(text[start:])
+    return out
+_RE_DDG_UDDG_HREF = re.compile(r'href="([^"]*duckduckgo\.com/l/\?[^"]*uddg=[^"]+)"', re.IGNORECASE)
+_RE_HTTP_HREF = re.compile(r'href="(https?://[^"]+)"', re.IGNORECASE)
+# both of the above in one pass: group 1 = DDG redirect href, group 2 = direct http(s) href
+_RE_DDG_ANY_HREF = re.compile(
+    r'href="(?:([^"]*duckduckgo\.com/l/\?[^"]*uddg=[^"]+)|(https?://[^"]+))"', re.IGNORECASE
+)
+_RE_HTTP_PREFIX = re.compile(r"https?://", re.IGNORECASE)
+_RE_UDDG = re.compile(r"(?:^|&)uddg=([^&]+)")
+
+def ddg_uddg_param(url: str) -> str:
+    """
+    First non-empty uddg= value from a DDG redirect URL's query, decoded the way
+    parse_qs would, without building the full urlparse/parse_qs structures.
+    """
+    m = _RE_UDDG.search(url.partition("#")[0].partition("?")[2])
+    return urllib.parse.unquote_plus(m.group(1)) if m else ""
+_RE_RFC_AUTHOR = re.compile(r"^[a-z][a-z\-]+(\s+[a-z][a-z\-]+)?\s+(bcp|std)\s*:\s*\d+")
+
+# Atomic tokens used by the fetch_page_text* block checks. One scan of the lowered page
+# yields the set of tokens present; the block rules then test set membership.
+_BLOCK_TOKENS = (
+    "sign in", "log in", "password", "create account", "join now",
+    "cookie", "consent", "accept", "agree",
+    "we value your privacy", "privacy choices", "accept all cookies",
+    "enable javascript", "please enable javascript", "this site requires javascript",
+    "checking your browser before accessing", "verify you are a human",
+    "captcha", "verify", "human", "unusual traffic", "robot", "automated", "are you a robot",
+    "cloudflare", "attention required", "security check",
+    "subscribe to continue", "subscription", "subscribe", "continue",
+    "to continue reading", "metered paywall",
+)
+
+if ahocorasick is not None:
+    _BLOCK_AC = ahocorasick.Automaton()
+    for _t in _BLOCK_TOKENS:
+        _BLOCK_AC.add_word(_t, _t)
+    _BLOCK_AC.make_automaton()
+    del _t
+else:
+    _BLOCK_AC = None
+
+# Block rules over the hit set: (all of these, plus any one of these if non-empty).
+# Hard blocks only (cookie banners are NOT hard blocks)
+_HARD_BLOCK_RULES: Tuple[Tuple[Tuple[str, ...], Tuple[str, ...]], ...] = (
+    (("sign in", "password"), ()),
+    (("log in", "password"), ()),
+    (("verify you are a human",), ()),
+    (("captcha",), ("verify", "human")),
+    (("are you a robot",), ()),
+    (("cloudflare",), ("attention required", "security check")),
+    (("checking your browser before accessing",), ()),
+    (("enable javascript",), ()),  # also covers "please enable javascript"
+    (("this site requires javascript",), ()),
+    (("subscribe to continue",), ()),
+    (("to continue reading",), ("subscribe", "sign in")),
+)
+
+# fetch_page_text_debug is stricter: also reports login walls, cookie/consent banners and paywalls
+_DEBUG_BLOCK_RULES = _HARD_BLOCK_RULES + (
+    (("create account",), ("sign in", "log in")),
+    (("join now",), ("sign in", "log in")),
+    (("cookie", "consent"), ("accept", "agree")),
+    (("we value your privacy", "cookie"), ()),
+    (("privacy choices", "cookie"), ()),
+    (("accept all cookies",), ()),
+    (("unusual traffic",), ("robot", "automated")),
+    (("subscription", "continue"), ()),
+    (("metered paywall",), ()),
+)
+
+def _page_blocked(hits: set, rules) -> bool:
+    # short-circuits on the first matching rule
+    for need, alt in rules:
+        if all(t in hits for t in need) and (not alt or any(t in hits for t in alt)):
+            return True
+    return False
+
+def _marker_hits(lowered: str) -> set:
+    hits = set()
+    if not lowered:
+        return hits
+    if _BLOCK_AC is not None:
+        for _end, tok in _BLOCK_AC.iter(lowered):
+            hits.add(tok)
+        return hits
+    # without the C automaton, plain substring checks beat any regex alternation
+    return {t for t in _BLOCK_TOKENS if t in lowered}
+
+_CTRL_CHARS = frozenset(chr(i) for i in range(32)) - {"\n", "\r", "\t"}
+
+_CMD_PREFIXES = (
+    ">", "$", "#", "sudo ", "ssh ", "cd ", "ls", "cat ", "tail ", "grep ", "nano ", "rm ",
+    "python", "./",
+)
+_CMD_INFIXES = (" | ", " >", "< ", " && ", " || ")
+_CMDLIKE = re.compile(
+    "^(?:" + "|".join(re.escape(p) for p in _CMD_PREFIXES) + ")"
+    "|" + "|".join(re.escape(p) for p in _CMD_INFIXES)
+)
+
+_TRANSCRIPT_PROMPT = re.compile("|".join(re.escape(b) for b in (
+    "copy and paste",
+    "new chat handoff",
+    "type a message",
+    "ctrl+c",
+    "shutting down",
+    "machine spirit brain online",
+    "usage:",
+)))
+
+_RE_DEEPEN = re.compile("|".join(re.escape(x) for x in (
+    "low confidence",
+    "deepen",
+    "curiosity",
+    "autonomy",
+    "expanded from",
+    "learned via",
+    "answer exists but confidence is low",
+)))
+
+_RE_JUNK_BULLET = re.compile(r"watch video", re.I)
+
+# metadata lines from RFC/IETF pages that shouldn't become bullets
+_RE_RFC_DROP = re.compile("|".join(re.escape(x) for x in (
+    "request for comments", "network working group", "obsoletes:", "updates:",
+    "category:", "bcp:", "std:", "status of this memo",
+)), re.I)
+
 # -----------------------------
 # Small utilities
 # -----------------------------
@@ -406,22 +638,50 @@ HIGH_AUTH_BUCKETS = {"rfc", "nist", "standards", "gov", "edu"}
 def now_ts() -> int:
     return int(time.time())
 
+# iso_now() is hit many times per second during batch learning; format once per second.
+_ISO_CACHE: Tuple[int, str] = (0, "")
+
 def iso_now() -> str:
-    return datetime.datetime.now().isoformat(timespec="seconds")
+    global _ISO_CACHE
+    t = int(time.time())
+    if t == _ISO_CACHE[0]:
+        return _ISO_CACHE[1]
+    s = datetime.datetime.fromtimestamp(t).isoformat(timespec="seconds")
+    _ISO_CACHE = (t, s)
+    return s
 
 def today_ymd() -> str:
-    return datetime.datetime.now().strftime("%Y-%m-%d")
+    return iso_now()[:10]
 
-def weekday_key() -> str:
-    return ["mon", "tue", "wed", "thu", "fri", "sat", "sun"][datetime.datetime.now().weekday()]
+# Set once ensure_dirs() has created the tree; backups and the change log call it on
+# every save, and nothing here removes these directories while running.
+_DIRS_READY = False
 
 def ensure_dirs() -> None:
+    global _DIRS_READY
+    if _DIRS_READY:
+        return
     os.makedirs(DATA_DIR, exist_ok=True)
     os.makedirs(LOGS_DIR, exist_ok=True)
     os.makedirs(EXPORTS_DIR, exist_ok=True)
     os.makedirs(BACKUPS_DIR, exist_ok=True)
+    _DIRS_READY = True
+
+def _file_has_bytes(path: str, data: bytes) -> bool:
+    # size check first so a changed store almost never costs a read
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except OSError:
+        return False
 
-def atomic_write_json(path: str, obj: Any) -> None:
+def atomic_write_json(path: str, obj: Any, backup: bool = False) -> bool:
+    """
+    Write obj to path atomically. Returns False (and leaves the file and its
+    backups alone) when the serialized bytes already match what is on disk.
+    """
     # MS_RFC_CONF_FLOOR_SAVE_V1
     # Apply RFC confidence floor when writing local_knowledge.json
     try:
@@ -432,92 +692,252 @@ def atomic_write_json(path: str, obj: Any) -> None:
     except Exception:
         pass
 
+    data = _json_dumps(obj)
+    if _file_has_bytes(path, data):
+        return False
+
+    if backup:
+        backup_file(path)
     tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False)
+    with open(tmp, "wb") as f:
+        f.write(data)
     os.replace(tmp, path)
+    return True
 
 def read_json(path: str, default: Any) -> Any:
     if not os.path.exists(path):
         return default
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return _json_loads(f.read())
     except Exception:
         return default
 
+# Parsed-JSON cache keyed by path; an entry is reused while the file's
+# (st_ino, st_mtime_ns, st_ctime_ns, st_size) is unchanged. Other processes (timers,
+# ms_ui.py) rewrite these stores too, often without changing the size and within one
+# mtime tick; every write ends in os.replace, so the inode tells those apart.
+_JSON_CACHE: Dict[str, Tuple[Tuple[int, int, int, int], Any]] = {}
+_JSON_MISS = object()
+
+def _stat_key(path: str) -> Tuple[int, int, int, int]:
+    st = os.stat(path)
+    return (st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size)
+
+def read_json_cached(path: str, default: Any) -> Any:
+    pending = _DEFERRED["dirty"].get(path, _JSON_MISS)
+    if pending is not _JSON_MISS:
+        return pending
+    try:
+        key = _stat_key(path)
+    except OSError:
+        _JSON_CACHE.pop(path, None)
+        return default
+    hit = _JSON_CACHE.get(path)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    data = read_json(path, _JSON_MISS)
+    if data is _JSON_MISS:
+        _JSON_CACHE.pop(path, None)
+        return default
+    _JSON_CACHE[path] = (key, data)
+    return data
+
+def json_cache_store(path: str, obj: Any) -> None:
+    # write-through: call right after the file has been replaced on disk
+    try:
+        _JSON_CACHE[path] = (_stat_key(path), obj)
+    except OSError:
+        _JSON_CACHE.pop(path, None)
+
+# Inside deferred_persistence(), save_store() only records the latest object per path
+# (read_json_cached hands it back to loaders); each dirty file is written once when
+# the outermost block exits. Process-wide so worker threads join the same batch.
+_DEFERRED: Dict[str, Any] = {"depth": 0, "dirty": {}}
+_DEFERRED_LOCK = threading.RLock()
+
+# lookup caches are disposable; they go through save_store for batching but are never backed up
+_NO_BACKUP_PATHS = frozenset({WIKI_CACHE_PATH, WEB_CACHE_PATH})
+
+def save_store(path: str, obj: Any) -> None:
+    with _DEFERRED_LOCK:
+        if _DEFERRED["depth"] > 0:
+            _DEFERRED["dirty"][path] = obj
+            return
+    atomic_write_json(path, obj, backup=path not in _NO_BACKUP_PATHS)
+    json_cache_store(path, obj)
+
+@contextlib.contextmanager
+def deferred_persistence():
+    with _DEFERRED_LOCK:
+        _DEFERRED["depth"] += 1
+    try:
+        yield
+    finally:
+        with _DEFERRED_LOCK:
+            _DEFERRED["depth"] -= 1
+            outermost = _DEFERRED["depth"] == 0
+        if outermost:
+            flush_deferred()
+
+def flush_deferred() -> None:
+    # also runs at exit, so an interrupted batch still reaches disk
+    with _DEFERRED_LOCK:
+        dirty = _DEFERRED["dirty"]
+        _DEFERRED["dirty"] = {}
+        depth = _DEFERRED["depth"]
+        _DEFERRED["depth"] = 0
+    try:
+        for path, obj in dirty.items():
+            save_store(path, obj)
+    finally:
+        with _DEFERRED_LOCK:
+            _DEFERRED["depth"] += depth
+
+atexit.register(flush_deferred)
+
+# Log files stay open for the life of the process (closed at exit).
+_LOG_FDS: Dict[str, Any] = {}
+
+def _close_log_fds() -> None:
+    for f in list(_LOG_FDS.values()):
+        try:
+            f.close()
+        except Exception:
+            pass
+    _LOG_FDS.clear()
+
+atexit.register(_close_log_fds)
+
+# text file objects aren't safe to share across threads (queue fetches log from workers)
+_LOG_LOCK = threading.Lock()
+
+def _log_write(path: str, text: str) -> None:
+    with _LOG_LOCK:
+        try:
+            f = _LOG_FDS.get(path)
+            if f is None or f.closed:
+                ensure_dirs()
+                f = _LOG_FDS[path] = open(path, "a", encoding="utf-8", buffering=8192)
+            f.write(text)
+            f.flush()
+        except Exception:
+            _LOG_FDS.pop(path, None)
+
 def safe_log(path: str, msg: str) -> None:
+    _log_write(path, f"[{iso_now()}] {msg}\n")
+
+class BufferedLogger:
+    """
+    Collects safe_log-style lines (stamped when logged) and writes them in one go on flush().
+    For loops that log several lines per item; flush before handing off to code that logs
+    directly, so the file keeps a sensible order.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.buf: List[str] = []
+
+    def log(self, msg: str) -> None:
+        self.buf.append(f"[{iso_now()}] {msg}\n")
+
+    def flush(self) -> None:
+        if self.buf:
+            _log_write(self.path, "".join(self.buf))
+            self.buf.clear()
+
+# Full-copy backups are rate-limited; per-change history goes to an append-only log instead.
+# Bulk/destructive commands force a snapshot (save_knowledge(..., checkpoint=True)).
+BACKUP_MIN_INTERVAL_S = 3600
+# The change log rolls over to <file>.log.1 .. .N once it passes the size cap.
+CHANGE_LOG_MAX_BYTES = 8 * 1024 * 1024
+CHANGE_LOG_KEEP = 3
+_LAST_BACKUP_TS: Dict[str, float] = {}
+
+def _last_backup_ts(base: str) -> float:
+    if base in _LAST_BACKUP_TS:
+        return _LAST_BACKUP_TS[base]
+    newest = 0.0
+    prefix = base + "."
     try:
-        ensure_dirs()
-        with open(path, "a", encoding="utf-8") as f:
-            f.write(f"[{iso_now()}] {msg}\n")
+        for de in os.scandir(BACKUPS_DIR):
+            if de.name.startswith(prefix) and de.name.endswith(".bak"):
+                newest = max(newest, de.stat().st_mtime)
     except Exception:
         pass
+    _LAST_BACKUP_TS[base] = newest
+    return newest
 
-def backup_file(path: str) -> Optional[str]:
+def backup_file(path: str, force: bool = False) -> Optional[str]:
     if not os.path.exists(path):
         return None
     ensure_dirs()
-    ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     base = os.path.basename(path)
+    if not force and (time.time() - _last_backup_ts(base)) < BACKUP_MIN_INTERVAL_S:
+        return None
+    ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     dst = os.path.join(BACKUPS_DIR, f"{base}.{ts}.bak")
     try:
         shutil.copy2(path, dst)
+        _LAST_BACKUP_TS[base] = time.time()
         return dst
     except Exception:
         return None
 
+def append_change_log(path: str, delta: Dict[str, Any]) -> None:
+    """Append one JSON line describing a change to data/backups/<file>.log."""
+    try:
+        ensure_dirs()
+        rec = {"ts": iso_now()}
+        rec.update(delta or {})
+        dst = os.path.join(BACKUPS_DIR, os.path.basename(path) + ".log")
+        with open(dst, "ab", buffering=65536) as f:
+            f.write(_json_line(rec))
+            size = f.tell()
+        if size > CHANGE_LOG_MAX_BYTES:
+            _rotate_change_log(dst)
+    except Exception:
+        pass
+
+def _rotate_change_log(dst: str) -> None:
+    for i in range(CHANGE_LOG_KEEP - 1, 0, -1):
+        older = f"{dst}.{i}"
+        if os.path.exists(older):
+            os.replace(older, f"{dst}.{i + 1}")
+    os.replace(dst, dst + ".1")
+
+@functools.lru_cache(maxsize=8192)
 def normalize_topic(t: str) -> str:
-    t = (t or "").strip().lower()
-    t = re.sub(r"\s+", " ", t)
-    return t
+    # split()/join collapses and trims the same whitespace as _RE_WS, without the regex engine
+    return " ".join((t or "").lower().split())
 
 def is_urlish(s: str) -> bool:
     s = (s or "").strip()
     if not s:
         return False
-    if re.search(r"^(https?://)", s, re.IGNORECASE):
-        return True
-    if re.search(r"\bwww\.", s, re.IGNORECASE):
-        return True
-    if re.search(r"\b[a-z0-9-]+\.[a-z]{2,}\b", s, re.IGNORECASE):
-        return True
-    return False
+    return any(p.search(s) for p in _URLISH_PATTERNS)
 
 def has_control_chars(s: str) -> bool:
     if s is None:
         return False
-    for ch in s:
-        o = ord(ch)
-        if o < 32 and ch not in ("\n", "\r", "\t"):
-            return True
-    return False
+    return not _CTRL_CHARS.isdisjoint(s)
 
 def looks_like_terminal_command(s: str) -> bool:
     s = (s or "").strip()
     if not s:
         return False
-    if s.startswith((">", "$", "#", "sudo ", "ssh ", "cd ", "ls", "cat ", "tail ", "grep ", "nano ", "rm ", "python", "./")):
-        return True
-    if (" | " in s) or (" >" in s) or ("< " in s) or (" && " in s) or (" || " in s):
-        return True
-    return False
+    return bool(_CMDLIKE.search(s))
 
 def looks_like_transcript_prompt(s: str) -> bool:
     s = (s or "").strip().lower()
     if not s:
         return False
-    bad = [
-        "copy and paste",
-        "new chat handoff",
-        "type a message",
-        "ctrl+c",
-        "shutting down",
-        "machine spirit brain online",
-        "usage:",
-    ]
-    return any(b in s for b in bad)
+    return bool(_TRANSCRIPT_PROMPT.search(s))
 
+# pure function of the string; the same topics are rechecked on every tick/scan.
+# Sized to hold a whole store's topics so a full /lowest or /needsources pass
+# doesn't evict itself on a large knowledge file.
+@functools.lru_cache(maxsize=65536)
 def is_junk_topic(s: str) -> Tuple[bool, str]:
     if s is None:
         return True, "empty"
@@ -563,6 +983,7 @@ def parse_iso_to_ts(s: str) -> Optional[int]:
     except Exception:
         return None
 
+@functools.lru_cache(maxsize=8192)
 def get_domain(url: str) -> str:
     """
     Extract domain/host from a URL.
@@ -591,9 +1012,7 @@ def get_domain(url: str) -> str:
     try:
         if "duckduckgo.com/l/" in u and "uddg=" in u:
             u2 = u.replace("&amp;", "&")
-            p = urllib.parse.urlparse(u2)
-            qs = urllib.parse.parse_qs(p.query)
-            uddg = (qs.get("uddg") or [""])[0]
+            uddg = ddg_uddg_param(u2)
             if uddg:
                 u = urllib.parse.unquote(uddg)
                 if u.startswith("//"):
@@ -688,8 +1107,26 @@ def classify_source_bucket(url_or_label: str, title: str = "") -> Tuple[str, str
 
     return "other", d
 
+# Written as "_schema_v" on entries and "_evs_v" on evidence once they're normalized, so
+# later loads can skip the field checks. Bump when either shape gains fields.
+SHAPE_VERSION = 3
+
+def evidence_domain_count(domains: Any) -> int:
+    return len(set([(d or "").lower().strip() for d in (domains or []) if (d or "").strip()]))
+
+def entry_domain_count(entry: Dict[str, Any]) -> int:
+    # "_dcount" is kept by the writers (set_knowledge, /repair_evidence, shaping);
+    # entries that predate it are counted from evidence_domains
+    n = entry.get("_dcount")
+    if isinstance(n, int):
+        return n
+    return evidence_domain_count(entry.get("evidence_domains"))
+
 def ensure_evidence_shape(entry: Dict[str, Any]) -> Dict[str, Any]:
     ev = entry.get("evidence")
+    # fast path: already normalized on an earlier pass
+    if isinstance(ev, dict) and ev.get("_evs_v") == SHAPE_VERSION:
+        return entry
     if not isinstance(ev, dict):
         ev = {}
     if not isinstance(ev.get("domains"), dict):
@@ -700,6 +1137,7 @@ def ensure_evidence_shape(entry: Dict[str, Any]) -> Dict[str, Any]:
         ev["reinforce_count"] = 0
     if not isinstance(ev.get("last_reinforced"), str):
         ev["last_reinforced"] = ""
+    ev["_evs_v"] = SHAPE_VERSION
     entry["evidence"] = ev
     return entry
 
@@ -713,28 +1151,41 @@ def update_evidence(entry: Dict[str, Any], sources: List[str], source_titles: Op
         sources = []
 
     titles = source_titles if isinstance(source_titles, list) else []
-    while len(titles) < len(sources):
-        titles.append("")
 
+    # group repeats first so each distinct (source, title) is classified once
+    grouped: Dict[Tuple[str, str], int] = {}
     for i, s in enumerate(sources):
-        url = normalize_source_url(s)
-        bucket, domain = classify_source_bucket(s, titles[i] if i < len(titles) else "")
+        key = (s, titles[i] if i < len(titles) else "")
+        grouped[key] = grouped.get(key, 0) + 1
+
+    for (s, title), n in grouped.items():
+        bucket, domain = classify_source_bucket(s, title)
         if domain:
             if domain not in domains or not isinstance(domains.get(domain), dict):
                 domains[domain] = {"count": 0, "bucket": bucket}
-            domains[domain]["count"] = int(domains[domain].get("count") or 0) + 1
+            domains[domain]["count"] = int(domains[domain].get("count") or 0) + n
             # keep the strongest bucket seen for this domain
             prev_b = domains[domain].get("bucket") or "other"
             if AUTH_BUCKET_BONUS.get(bucket, 0.0) > AUTH_BUCKET_BONUS.get(prev_b, 0.0):
                 domains[domain]["bucket"] = bucket
 
-        buckets[bucket] = int(buckets.get(bucket) or 0) + 1
+        buckets[bucket] = int(buckets.get(bucket) or 0) + n
 
     ev["domains"] = domains
     ev["buckets"] = buckets
     entry["evidence"] = ev
     return entry
 
+def evidence_working_copy(existing: Any) -> Dict[str, Any]:
+    # the loaded store is cached/shared and compute_weighted_confidence mutates the entry's
+    # top-level fields and its evidence tree in place; copy just those, not the whole entry
+    if not isinstance(existing, dict):
+        return ensure_entry_shape({})
+    work = dict(existing)
+    if "evidence" in work:
+        work["evidence"] = copy.deepcopy(work["evidence"])
+    return ensure_entry_shape(work)
+
 def compute_weighted_confidence(existing_entry: Dict[str, Any], base_floor: float, sources: List[str]) -> Tuple[float, Dict[str, Any]]:
     """
     Evidence-based confidence:
@@ -760,25 +1211,24 @@ def compute_weighted_confidence(existing_entry: Dict[str, Any], base_floor: floa
     buckets = ev.get("buckets", {}) if isinstance(ev.get("buckets"), dict) else {}
 
     # Authority bonus: count each bucket once (presence-based)
-    authority_bonus = 0.0
-    for b, bonus in AUTH_BUCKET_BONUS.items():
-        if int(buckets.get(b) or 0) > 0:
-            authority_bonus += float(bonus)
+    mask = 0
+    for b, n in buckets.items():
+        if int(n or 0) > 0:
+            mask |= _BUCKET_IDX.get(b, 0)
+    authority_bonus = _BONUS_TABLE[mask]
 
     # Independent domain bonus
-    domain_count = len([d for d in domains.keys() if d])
+    # update_evidence never inserts empty domain keys, but older stores might have one
+    domain_count = len(domains) - (1 if "" in domains else 0)
     indep_bonus = 0.0
     if domain_count > 1:
         indep_bonus = min(INDEPENDENT_DOMAIN_BONUS_CAP, INDEPENDENT_DOMAIN_BONUS_PER_EXTRA * float(domain_count - 1))
 
     # High-authority independent confirmations multiplier
-    high_auth_domains = 0
-    for d, meta in domains.items():
-        if not isinstance(meta, dict):
-            continue
-        b = (meta.get("bucket") or "other").strip()
-        if b in HIGH_AUTH_BUCKETS:
-            high_auth_domains += 1
+    high_auth_domains = sum(
+        1 for meta in domains.values()
+        if isinstance(meta, dict) and (meta.get("bucket") or "other").strip() in HIGH_AUTH_BUCKETS
+    )
     mult = 1.0
     if high_auth_domains >= 2:
         mult = 1.12
@@ -833,21 +1283,76 @@ def compute_weighted_confidence(existing_entry: Dict[str, Any], base_floor: floa
 # -----------------------------
 
 def load_knowledge() -> Dict[str, Any]:
-    return read_json(KNOWLEDGE_PATH, {})
+    return read_json_cached(KNOWLEDGE_PATH, {})
+
+def save_knowledge(k: Dict[str, Any], checkpoint: bool = False) -> None:
+    if checkpoint:
+        # snapshot the on-disk store even inside the backup interval (bulk/destructive edits)
+        backup_file(KNOWLEDGE_PATH, force=True)
+    save_store(KNOWLEDGE_PATH, k)
 
-def save_knowledge(k: Dict[str, Any]) -> None:
-    backup_file(KNOWLEDGE_PATH)
-    atomic_write_json(KNOWLEDGE_PATH, k)
+def _knowledge_stamp() -> Optional[Tuple[int, int, int, int]]:
+    try:
+        return _stat_key(KNOWLEDGE_PATH)
+    except OSError:
+        return None
+
+# In-process /lowest index: (confidence, store position, topic) rows kept sorted with
+# bisect, so tied topics list in store order exactly like a stable sort. It is tied to
+# the loaded store object and the knowledge file stamp; set_knowledge patches it in
+# place, any other writer just forces a rebuild on the next read.
+_CONF_IDX: Dict[str, Any] = {"stamp": None}
+
+def conf_index(k: Dict[str, Any]) -> List[Tuple[float, int, str]]:
+    stamp = _knowledge_stamp()
+    if stamp is not None and _CONF_IDX["stamp"] == stamp and _CONF_IDX.get("store") is k:
+        return _CONF_IDX["rows"]
+    rows: List[Tuple[float, int, str]] = []
+    by_topic: Dict[str, Tuple[float, int, str]] = {}
+    for pos, (topic, entry) in enumerate(k.items()):
+        if is_junk_topic(topic)[0] or not isinstance(entry, dict):
+            continue
+        row = (float(entry.get("confidence", 0.0)), pos, topic)
+        rows.append(row)
+        by_topic[topic] = row
+    rows.sort()
+    # a store with unsaved (deferred) changes doesn't match the file, so don't keep it
+    if KNOWLEDGE_PATH not in _DEFERRED["dirty"]:
+        _CONF_IDX.update({"stamp": stamp, "store": k, "rows": rows, "by_topic": by_topic,
+                          "next": len(k)})
+    return rows
+
+def conf_index_update(topic: str, entry: Dict[str, Any], k: Dict[str, Any],
+                      pre_stamp: Optional[Tuple[int, int, int, int]]) -> None:
+    # pre_stamp: knowledge file stamp from just before this change was saved
+    if (_DEFERRED["depth"] > 0 or pre_stamp is None or _CONF_IDX["stamp"] != pre_stamp
+            or _CONF_IDX.get("store") is not k):
+        _CONF_IDX["stamp"] = None
+        return
+    rows = _CONF_IDX["rows"]
+    by_topic = _CONF_IDX["by_topic"]
+    old = by_topic.pop(topic, None)
+    if old is not None:
+        del rows[bisect.bisect_left(rows, old)]
+        pos = old[1]
+    else:
+        # new keys land at the end of the store
+        pos = _CONF_IDX["next"]
+        _CONF_IDX["next"] += 1
+    if not is_junk_topic(topic)[0]:
+        row = (float(entry.get("confidence", 0.0)), pos, topic)
+        bisect.insort(rows, row)
+        by_topic[topic] = row
+    _CONF_IDX["stamp"] = _knowledge_stamp()
 
 def load_aliases() -> Dict[str, str]:
-    return read_json(ALIASES_PATH, {})
+    return read_json_cached(ALIASES_PATH, {})
 
 def save_aliases(a: Dict[str, str]) -> None:
-    backup_file(ALIASES_PATH)
-    atomic_write_json(ALIASES_PATH, a)
+    save_store(ALIASES_PATH, a)
 
 def load_queue() -> List[Dict[str, Any]]:
-    q = read_json(QUEUE_PATH, [])
+    q = read_json_cached(QUEUE_PATH, [])
     if not isinstance(q, list):
         return []
     changed = False
@@ -880,24 +1385,22 @@ def load_queue() -> List[Dict[str, Any]]:
     return q
 
 def save_queue(q: List[Dict[str, Any]]) -> None:
-    backup_file(QUEUE_PATH)
-    atomic_write_json(QUEUE_PATH, q)
+    save_store(QUEUE_PATH, q)
 
 def load_pending_promotions() -> List[Dict[str, Any]]:
-    p = read_json(PENDING_PATH, [])
+    p = read_json_cached(PENDING_PATH, [])
     if not isinstance(p, list):
         return []
     return p
 
 def save_pending_promotions(p: List[Dict[str, Any]]) -> None:
-    backup_file(PENDING_PATH)
-    atomic_write_json(PENDING_PATH, p)
+    save_store(PENDING_PATH, p)
 
 def load_autonomy() -> Dict[str, Any]:
-    cfg = read_json(AUTONOMY_PATH, {})
+    cfg = read_json_cached(AUTONOMY_PATH, {})
     if not isinstance(cfg, dict):
         cfg = {}
-    merged = json.loads(json.dumps(AUTONOMY_DEFAULTS))
+    merged = copy.deepcopy(AUTONOMY_DEFAULTS)
     for k, v in cfg.items():
         merged[k] = v
     if isinstance(cfg.get("daily_themes"), dict):
@@ -907,13 +1410,112 @@ def load_autonomy() -> Dict[str, Any]:
     return merged
 
 def save_autonomy(cfg: Dict[str, Any]) -> None:
-    backup_file(AUTONOMY_PATH)
-    atomic_write_json(AUTONOMY_PATH, cfg)
+    save_store(AUTONOMY_PATH, cfg)
+
+WEEKDAY_KEYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+def _cfg_int(v: Any, default: int) -> int:
+    try:
+        return int(v)
+    except Exception:
+        return default
+
+def _cfg_topics(items: Any) -> Tuple[str, ...]:
+    if not isinstance(items, list):
+        return ()
+    return tuple(normalize_topic(t) for t in items if normalize_topic(t))
+
+@dataclass(slots=True)
+class AutonomyConfig:
+    """Read-only, typed view of autonomy.json (merged with defaults), parsed once per change."""
+    enabled: bool
+    max_queue_size_total: int
+    max_pending_plus_failed: int
+    daily_seed_limit: int
+    weekly_seed_limit: int
+    daily_autolearn_limit: int
+    weekly_autolearn_limit: int
+    protect_confidence_threshold: float
+    last_daily_ymd: str
+    last_weekly_ymd: str
+    daily_themes_by_weekday: Tuple[Tuple[str, ...], ...]  # indexed by datetime.weekday()
+    weekly_themes: Tuple[Tuple[str, ...], ...]
+
+    @classmethod
+    def from_dict(cls, cfg: Dict[str, Any]) -> "AutonomyConfig":
+        dt = cfg.get("daily_themes") or {}
+        if not isinstance(dt, dict):
+            dt = {}
+        wt = cfg.get("weekly_themes") or []
+        if not isinstance(wt, list):
+            wt = []
+        try:
+            protect = float(cfg.get("protect_confidence_threshold", 0.85))
+        except Exception:
+            protect = 0.85
+        return cls(
+            enabled=bool(cfg.get("enabled", True)),
+            max_queue_size_total=_cfg_int(cfg.get("max_queue_size_total", 250), 250),
+            max_pending_plus_failed=_cfg_int(cfg.get("max_pending_plus_failed", 80), 80),
+            daily_seed_limit=_cfg_int(cfg.get("daily_seed_limit", 3), 3),
+            weekly_seed_limit=_cfg_int(cfg.get("weekly_seed_limit", 6), 6),
+            daily_autolearn_limit=_cfg_int(cfg.get("daily_autolearn_limit", 2), 2),
+            weekly_autolearn_limit=_cfg_int(cfg.get("weekly_autolearn_limit", 3), 3),
+            protect_confidence_threshold=protect,
+            last_daily_ymd=str(cfg.get("last_daily_ymd") or ""),
+            last_weekly_ymd=str(cfg.get("last_weekly_ymd") or ""),
+            daily_themes_by_weekday=tuple(_cfg_topics(dt.get(k)) for k in WEEKDAY_KEYS),
+            weekly_themes=tuple(b for b in (_cfg_topics(x) for x in wt) if b),
+        )
+
+# (raw cached autonomy.json object, parsed config); raw is held so its id() stays valid
+_AUTONOMY_CFG: List[Any] = [None, None]
+
+def load_autonomy_config() -> AutonomyConfig:
+    raw = read_json_cached(AUTONOMY_PATH, None)
+    if raw is _AUTONOMY_CFG[0] and _AUTONOMY_CFG[1] is not None:
+        return _AUTONOMY_CFG[1]
+    ac = AutonomyConfig.from_dict(load_autonomy())
+    _AUTONOMY_CFG[0] = raw
+    _AUTONOMY_CFG[1] = ac
+    return ac
 
 # -----------------------------
 # Alias (fuzzy suggestion + accept)
 # -----------------------------
 
+# Trigram blocking index over knowledge keys. Rebuilt whenever the key list differs
+# (same-size swaps included); comparing the lists is far cheaper than rebuilding.
+_TRIGRAM_IDX: Dict[str, Any] = {}
+
+def _trigrams(s: str) -> set:
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+def _padded_trigrams(s: str) -> set:
+    # boundary-padded so short words with a typo still share prefix/suffix grams
+    return _trigrams("  " + s + " ")
+
+def _alias_index(knowledge: Dict[str, Any]) -> Dict[str, Any]:
+    keys = list(knowledge)
+    if _TRIGRAM_IDX.get("keys") == keys:
+        return _TRIGRAM_IDX
+    grams: Dict[str, set] = {}
+    ngrams: Dict[str, int] = {}
+    pos: Dict[str, int] = {}
+    short: List[str] = []
+    for i, k in enumerate(keys):
+        pos[k] = i
+        inner = _trigrams(k)
+        ngrams[k] = len(inner)
+        if not inner:
+            short.append(k)
+        for x in _padded_trigrams(k):
+            grams.setdefault(x, set()).add(k)
+    _TRIGRAM_IDX.clear()
+    _TRIGRAM_IDX.update({"keys": keys, "grams": grams, "ngrams": ngrams, "pos": pos,
+                         "short": short})
+    return _TRIGRAM_IDX
+
 def suggest_alias(topic: str, knowledge: Dict[str, Any], aliases: Dict[str, str]) -> Optional[str]:
     t = normalize_topic(topic)
     if not t:
@@ -925,12 +1527,44 @@ def suggest_alias(topic: str, knowledge: Dict[str, Any], aliases: Dict[str, str]
         return None
     if t in knowledge:
         return None
-    match = difflib.get_close_matches(t, keys, n=1, cutoff=0.70)
+
+    tg = _trigrams(t)
+    if not tg:
+        # too short to block on trigrams: score everything
+        match = difflib.get_close_matches(t, keys, n=1, cutoff=0.70)
+        if match:
+            return match[0]
+        for k in keys:
+            if t in k or k in t:
+                return k
+        return None
+
+    idx = _alias_index(knowledge)
+    postings = idx["grams"]
+    shared: Dict[str, int] = {}
+    for g in _padded_trigrams(t):
+        for k in postings.get(g, ()):
+            shared[k] = shared.get(k, 0) + 1
+
+    need = 2 if len(tg) >= 4 else 1
+    cands = [k for k, n in shared.items() if n >= need and k in knowledge]
+    match = difflib.get_close_matches(t, cands, n=1, cutoff=0.70)
     if match:
         return match[0]
-    for k in keys:
-        if t in k or k in t:
-            return k
+
+    inner: Dict[str, int] = {}
+    for g in tg:
+        for k in postings.get(g, ()):
+            inner[k] = inner.get(k, 0) + 1
+
+    # substring fallback: "t in k" needs all of t's trigrams, "k in t" all of k's
+    subs = [k for k, n in inner.items()
+            if (n == len(tg) or n >= idx["ngrams"].get(k, 0))
+            and k in knowledge and (t in k or k in t)]
+    subs += [k for k in idx["short"] if k in t and k in knowledge]
+    if subs:
+        # same winner as the old linear scan: first in knowledge order
+        return min(subs, key=lambda k: idx["pos"].get(k, 0))
     return None
 
 # -----------------------------
@@ -938,6 +1572,11 @@ def suggest_alias(topic: str, knowledge: Dict[str, Any], aliases: Dict[str, str]
 # -----------------------------
 
 def ensure_entry_shape(entry: Dict[str, Any]) -> Dict[str, Any]:
+    # fast path: already normalized on an earlier pass
+    if entry.get("_schema_v") == SHAPE_VERSION:
+        if "evidence" in entry:
+            entry = ensure_evidence_shape(entry)
+        return entry
     if "answer" not in entry:
         entry["answer"] = ""
     if "confidence" not in entry:
@@ -953,8 +1592,61 @@ def ensure_entry_shape(entry: Dict[str, Any]) -> Dict[str, Any]:
     # Phase 5.1 evidence is optional; only created when we learn from sources.
     if "evidence" in entry:
         entry = ensure_evidence_shape(entry)
+    entry["_dcount"] = evidence_domain_count(entry.get("evidence_domains"))
+    entry["_schema_v"] = SHAPE_VERSION
     return entry
 
+@dataclass(slots=True)
+class EntryView:
+    """Evidence/confirmation fields of one entry, type-checked once for the report commands."""
+    domains: List[str]
+    buckets: Dict[str, Any]
+    reinf: Dict[str, Any]
+    confirmed: Dict[str, Any]  # the entry's own dict when present, so callers can update it
+    confidence: Any
+    updated: str
+
+    @classmethod
+    def of(cls, entry: Dict[str, Any]) -> "EntryView":
+        # Phase 5.1: prefer the new stored fields (these are the source of truth)
+        domains = entry.get("evidence_domains")
+        buckets = entry.get("evidence_buckets")
+        reinf = entry.get("reinforcement")
+        updated = entry.get("updated", "")
+
+        # Back-compat fallback: some older entries may only have entry["evidence"]
+        if (domains is None) or (buckets is None) or (reinf is None):
+            ev = entry.get("evidence") or {}
+            if domains is None:
+                domains = ev.get("domains")
+            if buckets is None:
+                buckets = ev.get("buckets")
+            if reinf is None:
+                reinf = ev.get("reinforcement")
+
+        if not isinstance(domains, list):
+            domains = []
+        if not isinstance(buckets, dict):
+            buckets = {}
+        if not isinstance(reinf, dict):
+            reinf = {"count": 0, "last": updated}
+        confirmed = entry.get("confirmed")
+        if not isinstance(confirmed, dict):
+            confirmed = {"count": 0, "last": ""}
+        return cls(domains, buckets, reinf, confirmed, entry.get("confidence", 0.0), updated)
+
+def without_shape_markers(entry: Dict[str, Any]) -> Dict[str, Any]:
+    # the markers only vouch for this store's shaping; copies that leave it (/export) drop them
+    out = {f: v for f, v in entry.items() if f not in ("_schema_v", "_dcount")}
+    ev = out.get("evidence")
+    if isinstance(ev, dict) and "_evs_v" in ev:
+        out["evidence"] = {f: v for f, v in ev.items() if f != "_evs_v"}
+    return out
+
+def shape_imported_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    # entries from outside files may carry markers without the fields they vouch for
+    return ensure_entry_shape(without_shape_markers(entry))
+
 def set_knowledge(topic: str, answer: str, confidence: float, sources: Optional[List[str]] = None,
                   notes: str = "", taught_by_user: bool = False,
                   _merge_evidence: Optional[Dict[str, Any]] = None) -> None:
@@ -971,6 +1663,7 @@ def set_knowledge(topic: str, answer: str, confidence: float, sources: Optional[
     topic_n = normalize_topic(topic)
     if not topic_n:
         return
+    now = iso_now()
 
     def bucket_for_domain(domain: str) -> str:
         d = (domain or "").lower().strip()
@@ -1022,14 +1715,41 @@ def set_knowledge(topic: str, answer: str, confidence: float, sources: Optional[
 
     # Merge sources (unique)
     merged_sources: List[str] = []
-    for s in (entry.get("sources") or []) + (sources or []):
+    seen_sources = set()
+    new_sources: List[str] = []
+    old_sources = entry.get("sources") or []
+    for i, s in enumerate(old_sources + (sources or [])):
         s2 = (s or "").strip()
-        if s2 and s2 not in merged_sources:
+        if s2 and s2 not in seen_sources:
+            seen_sources.add(s2)
             merged_sources.append(s2)
+            if i >= len(old_sources):
+                new_sources.append(s2)
+
+    # Evidence (domains + bucket counts): evidence_domains/evidence_buckets are kept
+    # incrementally, so only domains not seen before are classified on each learn.
+    # The stored fields are trusted only while they still match the stored sources;
+    # other writers (/merge, /import, hand edits) can change sources without them.
+    domains = domains_from_sources(old_sources)
+    domain_set = set(domains)
+    prev_domains = entry.get("evidence_domains")
+    prev_buckets = entry.get("evidence_buckets")
+    stored = [(d or "").lower().strip() for d in (prev_domains or [])]
+    stored_domains = set(stored)
+    stored_domains.discard("")
+    if (isinstance(prev_domains, list) and isinstance(prev_buckets, dict)
+            and stored == domains
+            and sum(int(n or 0) for n in prev_buckets.values()) == len(domains)):
+        buckets = {bk: int(n or 0) for bk, n in prev_buckets.items()}
+    else:
+        buckets = bucket_counts(domains)
+    fresh = new_sources
 
-    # Evidence (domains + bucket counts) based on merged_sources
-    domains = domains_from_sources(merged_sources)
-    buckets = bucket_counts(domains)
+    added: List[str] = []
+    for d in domains_from_sources(fresh):
+        if d not in domain_set:
+            added.append(d)
+            domain_set.add(d)
 
     # If caller provided evidence to merge, merge it gently (do not duplicate)
     if isinstance(_merge_evidence, dict):
@@ -1037,19 +1757,24 @@ def set_knowledge(topic: str, answer: str, confidence: float, sources: Optional[
             extra_domains = _merge_evidence.get("domains") or _merge_evidence.get("evidence_domains") or []
             for d in (extra_domains or []):
                 d2 = (d or "").strip().lower()
-                if d2 and d2 not in domains:
-                    domains.append(d2)
-            buckets = bucket_counts(domains)
+                if d2 and d2 not in domain_set:
+                    added.append(d2)
+                    domain_set.add(d2)
         except Exception:
             pass
 
+    for d in added:
+        domains.append(d)
+        bk = bucket_for_domain(d)
+        buckets[bk] = buckets.get(bk, 0) + 1
+
     # Reinforcement bookkeeping (track, but does NOT raise confidence by itself)
     reinf = entry.get("reinforcement")
     if not isinstance(reinf, dict):
         reinf = {"count": 0, "last": ""}
     if not taught_by_user:
         reinf["count"] = int(reinf.get("count") or 0) + 1
-        reinf["last"] = iso_now()
+        reinf["last"] = now
 
     # Confirm bookkeeping (used to raise confidence)
     confirmed = entry.get("confirmed")
@@ -1061,21 +1786,18 @@ def set_knowledge(topic: str, answer: str, confidence: float, sources: Optional[
     domain_count = len(domains)
     confirm_count = int(confirmed.get("count") or 0)
 
-    # Base floor (we will never go below existing_conf)
-    new_conf = max(existing_conf, float(confidence))
-
-    # cap without user confirmation
-    cap_no_confirm = 0.92
-    cap_with_confirm = 0.99
-
-    can_raise_by_domains = (domain_count >= 2)
-    can_raise_by_user = (confirm_count >= 1)
-
-    if (not can_raise_by_domains) and (not can_raise_by_user):
-        # gate closed: do not raise beyond existing_conf (ignore incoming confidence bumps)
+    if domain_count < 2 and confirm_count < 1:
+        # gate closed (common single-source re-learn): do not raise beyond existing_conf,
+        # ignore incoming confidence bumps and skip the target math entirely
         new_conf = existing_conf
 
     else:
+        can_raise_by_user = (confirm_count >= 1)
+
+        # cap without user confirmation
+        cap_no_confirm = 0.92
+        cap_with_confirm = 0.99
+
         # gate open: compute a target based on domain_count + authority buckets
         # Base target starts at max(existing_conf, 0.55) so 2-source topics don't stay stuck at 0.45
         target = max(existing_conf, 0.55)
@@ -1109,68 +1831,186 @@ def set_knowledge(topic: str, answer: str, confidence: float, sources: Optional[
     # --- write fields
     entry["answer"] = (answer or "").strip()
     entry["confidence"] = float(new_conf)
-    entry["updated"] = iso_now()
+    entry["updated"] = now
     entry["notes"] = notes or entry.get("notes", "")
     entry["taught_by_user"] = bool(taught_by_user) or bool(entry.get("taught_by_user", False))
     entry["sources"] = merged_sources
     # Phase 5.1: track whether this update added a NEW independent domain
-    old_domains = set([(d or "").lower().strip() for d in (entry.get("evidence_domains") or []) if (d or "").strip()])
-    new_domains = set([(d or "").lower().strip() for d in (domains or []) if (d or "").strip()])
-    entry["_gained_new_domain"] = (len(new_domains - old_domains) > 0)
+    entry["_gained_new_domain"] = bool(domain_set.difference(stored_domains))
     entry["evidence_domains"] = domains
+    entry["_dcount"] = len(domains)  # already lowercased and deduped above
     entry["evidence_buckets"] = buckets
     entry["reinforcement"] = reinf
     entry["confirmed"] = confirmed
 
     k[topic_n] = entry
+    pre_stamp = _knowledge_stamp()
     save_knowledge(k)
+    conf_index_update(topic_n, entry, k, pre_stamp)
+    append_change_log(KNOWLEDGE_PATH, {"op": "set", "topic": topic_n, "entry": entry})
 
 # Web fetch/search + Phase 2 ranking
 # -----------------------------
 
+HTTP_CHUNK_BYTES = 64 * 1024
+HTTP_MAX_BYTES = 4 * 1024 * 1024
+HTTP_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120 Safari/537.36"
+)
+
+# Keep-alive pooled session when requests is available (DDG + page fetches reuse sockets/TLS);
+# otherwise http_get falls back to one urllib connection per request.
+try:
+    import requests  # type: ignore
+    _HTTP_SESSION = requests.Session()
+    _adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=32)
+    _HTTP_SESSION.mount("https://", _adapter)
+    _HTTP_SESSION.mount("http://", _adapter)
+    del _adapter
+except Exception:
+    requests = None
+    _HTTP_SESSION = None
+
+def _read_body(chunks) -> str:
+    # stream in chunks: decode as we go, bail on PDFs after the first chunk,
+    # and stop at HTTP_MAX_BYTES instead of buffering the whole body twice
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    parts: List[str] = []
+    total = 0
+    first = True
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if first:
+            # PDF_BLOCK_V1: block PDF bodies
+            if _ms_bytes_look_like_pdf(chunk):
+                raise RuntimeError('MS_SKIP_PDF_BODY')
+            first = False
+        if total + len(chunk) > HTTP_MAX_BYTES:
+            chunk = chunk[:HTTP_MAX_BYTES - total]
+        total += len(chunk)
+        parts.append(decoder.decode(chunk))
+        if total >= HTTP_MAX_BYTES:
+            break
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)
+
+def _iter_urllib_chunks(resp):
+    while True:
+        chunk = resp.read(HTTP_CHUNK_BYTES)
+        if not chunk:
+            return
+        yield chunk
+
 def http_get(url: str, timeout: int = 15, headers: Optional[Dict[str, str]] = None) -> Tuple[int, str]:
     if urllib is None:
         return 0, ""
     # PDF_BLOCK_V1: block PDFs before request
     if _ms_is_pdf_url(str(url)):
         raise RuntimeError('MS_SKIP_PDF_URL')
-    req = urllib.request.Request(url, headers=headers or {
-        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36"
-    })
-    try:
-        # PDF_BLOCK_V1: skip PDF URLs early
+    hdrs = headers or {"User-Agent": HTTP_USER_AGENT}
+
+    if _HTTP_SESSION is not None:
         try:
-            _ms_u = None
-            _ms_arg = None
-            # best effort: if the call uses a Request object, it has .full_url
-            # (we can’t reliably parse the expression here, so we guard after Request() too)
+            with _HTTP_SESSION.get(url, headers=hdrs, timeout=timeout, stream=True) as r:
+                # urlopen raises on 4xx/5xx; keep the same (0, "") contract
+                if r.status_code >= 400:
+                    return 0, ""
+                return int(r.status_code), _read_body(r.iter_content(HTTP_CHUNK_BYTES))
         except Exception:
-            pass
+            return 0, ""
+
+    req = urllib.request.Request(url, headers=hdrs)
+    try:
         with urllib.request.urlopen(req, timeout=timeout) as resp:
             code = getattr(resp, "status", 200)
-            body = resp.read()
-            # PDF_BLOCK_V1: block PDF bodies
-            if _ms_bytes_look_like_pdf(body):
-                raise RuntimeError('MS_SKIP_PDF_BODY')
-
-            try:
-                text = body.decode("utf-8", errors="replace")
-            except Exception:
-                text = str(body)
-            return int(code), text
+            return int(code), _read_body(_iter_urllib_chunks(resp))
     except Exception:
         return 0, ""
 
 def strip_html(html: str) -> str:
     if not html:
         return ""
-    html = re.sub(r"(?is)<(script|style).*?>.*?</\1>", " ", html)
-    html = re.sub(r"(?is)<.*?>", " ", html)
-    html = html.replace("&nbsp;", " ").replace("&amp;", "&").replace("&lt;", "<").replace("&gt;", ">")
-    html = html.replace("&#39;", "'").replace("&quot;", '"')
-    html = re.sub(r"\s+", " ", html).strip()
+    html = _HTML_SCRIPT.sub(" ", html)
+    html = _HTML_TAG.sub(" ", html)
+    html = html_lib.unescape(html)
+    html = _RE_WS.sub(" ", html).strip()
     return html
 
+# -----------------------------
+# Disk-backed TTL memoization for pure network lookups
+# -----------------------------
+
+# serializes read-modify-write of cache files (searches can run on worker threads)
+_TTL_CACHE_LOCK = threading.Lock()
+
+def ttl_cache(path: str, ttl: int, restore=None, keep=None):
+    """
+    Memoize fn(...) in a JSON file as {"fn|args": [ts, value]}.
+    Arguments are bound to the signature (defaults filled in) so f(x) and f(x, n=default)
+    share a key.
+    Only results passing keep() are cached (default: non-None); restore() rebuilds the value
+    after a JSON round-trip. Expired entries are dropped whenever the file is rewritten.
+    New results are saved through save_store(), so inside deferred_persistence() (queue runs,
+    /weblearn) the file is written once at the end of the batch instead of on every miss.
+    """
+    def deco(fn):
+        sig = inspect.signature(fn)
+
+        def wrapper(*args, **kwargs):
+            try:
+                bound = sig.bind(*args, **kwargs)
+                bound.apply_defaults()
+                args_json = json.dumps(list(bound.arguments.values()), ensure_ascii=False)
+                key = f"{fn.__name__}|{args_json}"
+            except Exception:
+                return fn(*args, **kwargs)
+            cache = read_json_cached(path, {})
+            if not isinstance(cache, dict):
+                cache = {}
+            hit = cache.get(key)
+            if isinstance(hit, list) and len(hit) == 2:
+                try:
+                    if now_ts() - int(hit[0]) < ttl:
+                        return restore(hit[1]) if restore else hit[1]
+                except Exception:
+                    pass
+            value = fn(*args, **kwargs)
+            if (keep(value) if keep else value is not None):
+                try:
+                    with _TTL_CACHE_LOCK:
+                        ensure_dirs()
+                        now = now_ts()
+                        cache = read_json_cached(path, {})
+                        if not isinstance(cache, dict):
+                            cache = {}
+                        cache = {
+                            k: v for k, v in cache.items()
+                            if isinstance(v, list) and len(v) == 2
+                            and isinstance(v[0], (int, float)) and now - v[0] < ttl
+                        }
+                        cache[key] = [now, value]
+                        save_store(path, cache)
+                except Exception:
+                    pass
+            return value
+        wrapper.__name__ = fn.__name__
+        wrapper.__doc__ = fn.__doc__
+        return wrapper
+    return deco
+
+def ttl_cache_clear(path: str) -> None:
+    try:
+        if os.path.exists(path):
+            os.remove(path)
+    except Exception:
+        pass
+    with _DEFERRED_LOCK:
+        _DEFERRED["dirty"].pop(path, None)
+    _JSON_CACHE.pop(path, None)
+
+@ttl_cache(WIKI_CACHE_PATH, WIKI_CACHE_TTL_SECONDS)
 def wiki_opensearch_title(query: str) -> Optional[str]:
     if urllib is None:
         return None
@@ -1180,7 +2020,7 @@ def wiki_opensearch_title(query: str) -> Optional[str]:
     if code != 200 or not text:
         return None
     try:
-        data = json.loads(text)
+        data = _json_loads(text)
         titles = data[1] if len(data) > 1 else []
         if titles:
             return titles[0]
@@ -1188,6 +2028,7 @@ def wiki_opensearch_title(query: str) -> Optional[str]:
         return None
     return None
 
+@ttl_cache(WIKI_CACHE_PATH, WIKI_CACHE_TTL_SECONDS, restore=tuple)
 def wiki_summary(title: str) -> Optional[Tuple[str, str]]:
     if urllib is None:
         return None
@@ -1200,7 +2041,7 @@ def wiki_summary(title: str) -> Optional[Tuple[str, str]]:
     if code != 200 or not text:
         return None
     try:
-        data = json.loads(text)
+        data = _json_loads(text)
         extract = (data.get("extract") or "").strip()
         page_url = ""
         content_urls = data.get("content_urls") or {}
@@ -1224,10 +2065,8 @@ def clean_ddg_link(link: str) -> str:
         link = link.replace("&amp;", "&")
     try:
         if "duckduckgo.com/l/?" in link and "uddg=" in link and urllib is not None:
-            p = urllib.parse.urlparse(link)
-            qs = urllib.parse.parse_qs(p.query)
-            if "uddg" in qs and qs["uddg"]:
-                target = qs["uddg"][0]
+            target = ddg_uddg_param(link)
+            if target:
                 target = urllib.parse.unquote(target).strip()
                 if target.startswith("//"):
                     target = "https:" + target
@@ -1253,22 +2092,33 @@ def ddg_search(query: str, max_results: int = 10) -> List[Dict[str, str]]:
     except Exception:
         return []
 
+STANDARDS_SITES = ("rfc-editor.org", "ietf.org", "nist.gov")
+
+def _standards_hit(site: str, topic: str) -> Optional[str]:
+    try:
+        c = ddg_html_results(f"site:{site} {topic}", max_results=6)
+    except Exception:
+        c = []
+    best = choose_preferred_source(c) if c else None
+    return best["url"] if best and best.get("url") else None
+
 def try_standards_first(topic: str) -> Optional[Tuple[str, str]]:
-    c1 = ddg_html_results(f"site:rfc-editor.org {topic}", max_results=6)
-    best = choose_preferred_source(c1) if c1 else None
-    if best and best.get("url"):
-        return best["url"], "rfc-editor.org"
-    c2 = ddg_html_results(f"site:ietf.org {topic}", max_results=6)
-    best = choose_preferred_source(c2) if c2 else None
-    if best and best.get("url"):
-        return best["url"], "ietf.org"
-    c3 = ddg_html_results(f"site:nist.gov {topic}", max_results=6)
-    best = choose_preferred_source(c3) if c3 else None
-    if best and best.get("url"):
-        return best["url"], "nist.gov"
+    # Preference order: rfc-editor > ietf > nist. rfc-editor usually answers, so it is
+    # searched alone; only on a miss are the other two searched together. Firing all three
+    # up front cost every lookup (times the queue workers) three DDG requests.
+    first, rest = STANDARDS_SITES[0], STANDARDS_SITES[1:]
+    url = _standards_hit(first, topic)
+    if url:
+        return url, first
+    with ThreadPoolExecutor(max_workers=len(rest)) as ex:
+        hits = list(ex.map(lambda site: _standards_hit(site, topic), rest))
+    for site, url in zip(rest, hits):
+        if url:
+            return url, site
     return None
 
 
+@ttl_cache(WEB_CACHE_PATH, WEB_CACHE_TTL_SECONDS, keep=bool)
 def ddg_lite_results(query: str, max_results: int = 5) -> List[Dict[str, str]]:
     """
     DuckDuckGo Lite HTML results (headless-friendly).
@@ -1282,22 +2132,13 @@ def ddg_lite_results(query: str, max_results: int = 5) -> List[Dict[str, str]]:
     q = urllib.parse.quote_plus(query.strip())
     url = f"https://lite.duckduckgo.com/lite/?q={q}"
 
+    # through http_get so the pooled keep-alive session is reused across searches
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        # PDF_BLOCK_V1: skip PDF URLs early
-        try:
-            _ms_u = None
-            _ms_arg = None
-            # best effort: if the call uses a Request object, it has .full_url
-            # (we can’t reliably parse the expression here, so we guard after Request() too)
-        except Exception:
-            pass
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            html = resp.read().decode("utf-8", "ignore")
+        code, html = http_get(url, timeout=15, headers={"User-Agent": "Mozilla/5.0"})
     except Exception:
         return []
 
-    if not html:
+    if not code or not html:
         return []
 
     html = html.replace("&amp;", "&")
@@ -1305,7 +2146,7 @@ def ddg_lite_results(query: str, max_results: int = 5) -> List[Dict[str, str]]:
     results: List[Dict[str, str]] = []
     seen = set()
 
-    for mm in re.finditer(r'href="([^"]*duckduckgo\.com/l/\?[^"]*uddg=[^"]+)"', html, flags=re.I):
+    for mm in _RE_DDG_UDDG_HREF.finditer(html):
         href = (mm.group(1) or "").strip()
         if not href:
             continue
@@ -1314,9 +2155,7 @@ def ddg_lite_results(query: str, max_results: int = 5) -> List[Dict[str, str]]:
 
         target = ""
         try:
-            p = urllib.parse.urlparse(href)
-            qs = urllib.parse.parse_qs(p.query)
-            uddg = (qs.get("uddg") or [""])[0]
+            uddg = ddg_uddg_param(href)
             if uddg:
                 target = urllib.parse.unquote(uddg).strip()
         except Exception:
@@ -1338,41 +2177,49 @@ def ddg_lite_results(query: str, max_results: int = 5) -> List[Dict[str, str]]:
 
     return results
 
-def source_score(url: str, title: str = "") -> int:
-    d = get_domain(url)
-    t = (title or "").lower()
-    score = 0
-    if "rfc-editor.org" in d:
-        score += 120
-    if "ietf.org" in d:
-        score += 100
-    if d.endswith(".gov"):
-        score += 95
-    if d.endswith(".edu"):
-        score += 95
-    if "nist.gov" in d:
-        score += 110
-
+# source_score rule tables: each (needles, weight) group applies once if any needle is a
+# substring of the domain; suffix rules apply on endswith.
+_SOURCE_DOMAIN_RULES: Tuple[Tuple[Tuple[str, ...], int], ...] = (
+    (("rfc-editor.org",), 120),
+    (("ietf.org",), 100),
+    (("nist.gov",), 110),
     # Wikipedia should never be a "main" learning source unless nothing else works.
-    if "wikipedia.org" in d:
-        score -= 80
-
-    vendor_signals = ["docs.", "support.", "developer.", "learn.", "kb."]
-    if any(v in d for v in vendor_signals):
-        score += 25
-
-    blog_signals = ["blog", "medium.com", "wordpress", "blogspot", "substack"]
-    bad_domains = ["linkedin.com", "facebook.com", "quora.com", "pinterest.com"]
-
+    (("wikipedia.org",), -80),
+    (("docs.", "support.", "developer.", "learn.", "kb."), 25),
     # If DDG redirect wrappers leak through anywhere, nuke them
-    if "duckduckgo.com" in d:
-        score -= 200
-
-    if any(bd in d for bd in bad_domains):
-        score -= 120
-    if any(b in d for b in blog_signals):
-        score -= 35
-    if any(w in t for w in ["opinion", "my experience", "top 10", "best", "review"]):
+    (("duckduckgo.com",), -200),
+    (("linkedin.com", "facebook.com", "quora.com", "pinterest.com"), -120),
+    (("blog", "medium.com", "wordpress", "blogspot", "substack"), -35),
+)
+_SOURCE_SUFFIX_RULES: Tuple[Tuple[str, int], ...] = ((".gov", 95), (".edu", 95))
+# All rule needles in one lookahead alternation (longest first). A match for a needle
+# also implies every rule with a needle that is a prefix of it, since only one
+# alternative is reported per start offset.
+_SOURCE_NEEDLES = sorted({n for needles, _w in _SOURCE_DOMAIN_RULES for n in needles},
+                         key=len, reverse=True)
+_SOURCE_NEEDLE_RULES: Dict[str, frozenset] = {
+    n: frozenset(i for i, (needles, _w) in enumerate(_SOURCE_DOMAIN_RULES)
+                 if any(n.startswith(x) for x in needles))
+    for n in _SOURCE_NEEDLES
+}
+_RE_SOURCE_NEEDLES = re.compile("(?=(" + "|".join(re.escape(n) for n in _SOURCE_NEEDLES) + "))")
+_RE_SOURCE_TITLE_BAD = re.compile("opinion|my experience|top 10|best|review")
+
+@functools.lru_cache(maxsize=4096)
+def _domain_score(d: str) -> int:
+    hit: set = set()
+    for m in _RE_SOURCE_NEEDLES.finditer(d):
+        hit |= _SOURCE_NEEDLE_RULES[m.group(1)]
+    score = sum(_SOURCE_DOMAIN_RULES[i][1] for i in hit)
+    for suffix, weight in _SOURCE_SUFFIX_RULES:
+        if d.endswith(suffix):
+            score += weight
+    return score
+
+@functools.lru_cache(maxsize=4096)
+def source_score(url: str, title: str = "") -> int:
+    score = _domain_score(get_domain(url))
+    if title and _RE_SOURCE_TITLE_BAD.search(title.lower()):
         score -= 15
     if url.startswith("https://"):
         score += 5
@@ -1381,13 +2228,8 @@ def source_score(url: str, title: str = "") -> int:
 def choose_best_source(candidates: List[Dict[str, str]]) -> Optional[Dict[str, str]]:
     if not candidates:
         return None
-    scored = []
-    for c in candidates:
-        url = c.get("url", "")
-        title = c.get("title", "")
-        scored.append((source_score(url, title), c))
-    scored.sort(key=lambda x: x[0], reverse=True)
-    return scored[0][1]
+    # max() keeps the first of equal scores, same as the stable descending sort did
+    return max(candidates, key=lambda c: source_score(c.get("url", ""), c.get("title", "")))
 
 
 def choose_preferred_source(candidates: List[Dict[str, str]]) -> Optional[Dict[str, str]]:
@@ -1411,9 +2253,7 @@ def choose_preferred_source_excluding(candidates: List[Dict[str, str]], avoid_do
             u = "https:" + u
         try:
             if urllib is not None and "duckduckgo.com/l/" in u and "uddg=" in u:
-                p = urllib.parse.urlparse(u)
-                qs = urllib.parse.parse_qs(p.query)
-                uddg = (qs.get("uddg") or [""])[0]
+                uddg = ddg_uddg_param(u)
                 if uddg:
                     t = urllib.parse.unquote(uddg).strip()
                     if t.startswith("//"):
@@ -1435,11 +2275,12 @@ def choose_preferred_source_excluding(candidates: List[Dict[str, str]], avoid_do
             host = host[4:]
         return host
 
-    def _is_wiki(u: str) -> bool:
-        d = _domain(u)
+    def _is_wiki(d: str) -> bool:
         return ("wikipedia.org" in d) or ("wiktionary.org" in d) or ("wikidata.org" in d)
 
-    cleaned: List[Dict[str, str]] = []
+    # (candidate, domain): the domain is parsed once here and reused for the wiki
+    # filter and scoring below
+    cleaned: List[Tuple[Dict[str, str], str]] = []
     for c in candidates:
         if not isinstance(c, dict):
             continue
@@ -1452,16 +2293,15 @@ def choose_preferred_source_excluding(candidates: List[Dict[str, str]], avoid_do
             continue
         c2 = dict(c)
         c2["url"] = u
-        cleaned.append(c2)
+        cleaned.append((c2, d))
 
     if not cleaned:
         return None
 
-    nonwiki = [c for c in cleaned if not _is_wiki(c.get("url",""))]
+    nonwiki = [cd for cd in cleaned if not _is_wiki(cd[1])]
     pool = nonwiki if nonwiki else cleaned
 
-    def _score(u: str) -> int:
-        d = _domain(u)
+    def _score(d: str) -> int:
         s = 0
 
         # Standards / primary sources
@@ -1477,21 +2317,12 @@ def choose_preferred_source_excluding(candidates: List[Dict[str, str]], avoid_do
             s += 40
 
         # Hard penalty (but only relevant if wiki is only thing left)
-        if ("wikipedia.org" in d) or ("wiktionary.org" in d) or ("wikidata.org" in d):
+        if _is_wiki(d):
             s -= 999
 
         return s
 
-    best = None
-    best_s = -10**9
-    for c in pool:
-        u = (c.get("url") or "").strip()
-        sc = _score(u)
-        if sc > best_s:
-            best_s = sc
-            best = c
-
-    return best
+    return max(pool, key=lambda cd: _score(cd[1]))[0]
 
 def fetch_page_text_debug(url: str, max_chars: int = 12000) -> Tuple[bool, str, str]:
     """
@@ -1502,47 +2333,20 @@ def fetch_page_text_debug(url: str, max_chars: int = 12000) -> Tuple[bool, str,
     if code != 200 or not body:
         return False, "", f"http_{code}"
 
-    lowered_html = body.lower()
-
-    blocked_markers = [
-        ("sign in" in lowered_html and "password" in lowered_html),
-        ("log in" in lowered_html and "password" in lowered_html),
-        ("create account" in lowered_html and ("sign in" in lowered_html or "log in" in lowered_html)),
-        ("join now" in lowered_html and ("sign in" in lowered_html or "log in" in lowered_html)),
-
-        ("cookie" in lowered_html and "consent" in lowered_html and ("accept" in lowered_html or "agree" in lowered_html)),
-        ("we value your privacy" in lowered_html and "cookie" in lowered_html),
-        ("privacy choices" in lowered_html and "cookie" in lowered_html),
-        ("accept all cookies" in lowered_html and "cookie" in lowered_html),
-
-        ("enable javascript" in lowered_html),
-        ("please enable javascript" in lowered_html),
-        ("this site requires javascript" in lowered_html),
-        ("checking your browser before accessing" in lowered_html),
-
-        ("captcha" in lowered_html and ("verify" in lowered_html or "human" in lowered_html)),
-        ("unusual traffic" in lowered_html and ("robot" in lowered_html or "automated" in lowered_html)),
-        ("are you a robot" in lowered_html),
-        ("cloudflare" in lowered_html and ("attention required" in lowered_html or "security check" in lowered_html)),
-
-        ("subscribe to continue" in lowered_html),
-        ("subscription" in lowered_html and "continue" in lowered_html),
-        ("to continue reading" in lowered_html and ("subscribe" in lowered_html or "sign in" in lowered_html)),
-        ("metered paywall" in lowered_html),
-    ]
-    if any(blocked_markers):
+    if _page_blocked(_marker_hits(body.lower()), _DEBUG_BLOCK_RULES):
         return False, "", "blocked_marker"
 
+    # strip_html already collapses whitespace and strips
     text = strip_html(body)
     if not text:
         return False, "", "strip_empty"
 
-    cleaned = re.sub(r"\s+", " ", (text or "")).strip()
-    if len(cleaned) < 500:
-        return False, "", f"thin_{len(cleaned)}"
+    if len(text) < 500:
+        return False, "", f"thin_{len(text)}"
 
     return True, text, "ok"
 
+@ttl_cache(WEB_CACHE_PATH, WEB_CACHE_TTL_SECONDS, restore=tuple, keep=lambda r: bool(r and r[0]))
 def fetch_page_text(url: str, max_chars: int = 12000) -> Tuple[bool, str]:
     # MS_PDF_SKIP_HANDLER_V1
     try:
@@ -1558,28 +2362,14 @@ def fetch_page_text(url: str, max_chars: int = 12000) -> Tuple[bool, str]:
     if code != 200 or not body:
         return False, ""
 
-    lowered_html = body.lower()
-
-    # Hard blocks only (cookie banners are NOT hard blocks)
-    hard_blocks = [
-        ("sign in" in lowered_html and "password" in lowered_html),
-        ("log in" in lowered_html and "password" in lowered_html),
-        ("verify you are a human" in lowered_html),
-        ("captcha" in lowered_html and ("verify" in lowered_html or "human" in lowered_html)),
-        ("are you a robot" in lowered_html),
-        ("cloudflare" in lowered_html and ("attention required" in lowered_html or "security check" in lowered_html)),
-        ("checking your browser before accessing" in lowered_html),
-        ("please enable javascript" in lowered_html),
-        ("enable javascript" in lowered_html),
-        ("this site requires javascript" in lowered_html),
-        ("subscribe to continue" in lowered_html),
-        ("to continue reading" in lowered_html and ("subscribe" in lowered_html or "sign in" in lowered_html)),
-    ]
-    if any(hard_blocks):
+    # Hard blocks only (cookie banners are NOT hard blocks); the lowered copy is
+    # only needed for the single marker scan
+    if _page_blocked(_marker_hits(body.lower()), _HARD_BLOCK_RULES):
         return False, ""
 
+    # strip_html already collapses whitespace and strips; check length before lowering
     text = strip_html(body)
-    if not text:
+    if len(text) < 700:
         return False, ""
 
     low = text.lower()
@@ -1590,104 +2380,94 @@ def fetch_page_text(url: str, max_chars: int = 12000) -> Tuple[bool, str]:
         ("captcha" in low and ("human" in low or "verify" in low))):
         return False, ""
 
-    cleaned = re.sub(r"\s+", " ", text).strip()
-    if len(cleaned) < 700:
-        return False, ""
-
-    return True, cleaned[:max_chars]
-
-def pick_definition_sentence(topic: str, text: str) -> str:
+    return True, text[:max_chars]
+
+# pick_definition_sentence signal tables
+_DEF_JUNK_SIGNALS = (
+    "status of this memo",
+    "rfc home", "text | pdf | html", "tracker", "ipr", "errata", "info page",
+    "network working group", "request for comments",
+    "obsoletes:", "updates:", "category:", "issn:", "doi:", "bcp:", "std:",
+)
+_RE_DEF_JUNK = re.compile("|".join(re.escape(j) for j in _DEF_JUNK_SIGNALS))
+_DEF_PREFER_PHRASES = (
+    "this document describes",
+    "this document specifies",
+    "this document defines",
+    "this memo defines",
+    "this document provides",
+    "this document discusses",
+)
+
+def pick_definition_sentence(topic: str, text: str, sentences: Optional[List[str]] = None) -> str:
     topic_n = normalize_topic(topic)
 
     # RFC/standards pages often have ugly nav headers or metadata lines. We skip those.
-    def is_header_junk(s: str) -> bool:
-        s0 = (s or "").strip()
+    # s0 is already whitespace-normalized; low is its lowercase form.
+    def is_header_junk(s0: str, low: str) -> bool:
         if not s0:
             return True
-        low = s0.lower()
-
-        junk_signals = [
-            "status of this memo",
-            "rfc home", "text | pdf | html", "tracker", "ipr", "errata", "info page",
-            "network working group", "request for comments",
-            "obsoletes:", "updates:", "category:", "issn:", "doi:", "bcp:", "std:",
-        ]
-        if any(j in low for j in junk_signals):
+
+        # very long "sentence" is usually scraped header/nav (cheapest check first)
+        if len(s0) > 220:
+            return True
+
+        if _RE_DEF_JUNK.search(low):
             return True
 
         # author/affiliation-ish lines that show up early in RFC HTML
-        if re.match(r"^[a-z][a-z\-]+(\s+[a-z][a-z\-]+)?\s+(bcp|std)\s*:\s*\d+", low):
+        if _RE_RFC_AUTHOR.match(low):
             return True
 
         # lots of bracket/pipe markup is usually navigation
-        if s0.count("[") >= 1 and s0.count("]") >= 1:
+        if "[" in s0 and "]" in s0:
             return True
         if s0.count("|") >= 2:
             return True
 
-        # very long "sentence" is usually scraped header/nav
-        if len(s0) > 220:
-            return True
-
         return False
 
-    # Split loosely: RFC pages sometimes don’t have clean punctuation breaks
-    chunks = re.split(r"[\n\r]+|(?<=[\.\!\?])\s+", text)
-
-    def norm(s: str) -> str:
-        return re.sub(r"\s+", " ", (s or "")).strip()
-
-    # Pass 1: prefer actual definition phrases
-    prefer_phrases = [
-        "this document describes",
-        "this document specifies",
-        "this document defines",
-        "this memo defines",
-        "this document provides",
-        "this document discusses",
-    ]
-    for s in chunks[:180]:
-        s2 = norm(s)
+    # Split loosely: RFC pages sometimes don’t have clean punctuation breaks.
+    # Callers that already have the sentence split pass it in; we only break on newlines here.
+    if sentences is None:
+        chunks = _RE_CHUNK_SPLIT.split(text)
+    else:
+        chunks = [c for sent in sentences for c in _RE_NEWLINES.split(sent)]
+
+    # One sweep over the first 180 chunks, in order of preference:
+    #   1) a definition phrase ("this document defines...") -> return immediately
+    #   2) otherwise the first chunk containing the topic
+    #   3) otherwise the first clean chunk within the first 120
+    found_topic = ""
+    found_any = ""
+    for i, s in enumerate(chunks[:180]):
+        s2 = _RE_WS.sub(" ", (s or "")).strip()
         if not s2:
             continue
         low = s2.lower()
-        if is_header_junk(s2):
+        if is_header_junk(s2, low):
             continue
-        if any(p in low for p in prefer_phrases):
+        if any(p in low for p in _DEF_PREFER_PHRASES):
             return s2
+        if not found_topic and topic_n and topic_n in low:
+            found_topic = s2
+        if not found_any and i < 120:
+            found_any = s2
 
-    # Pass 2: prefer a chunk containing the topic, but skip junk
-    for s in chunks[:180]:
-        s2 = norm(s)
-        if not s2:
-            continue
-        if is_header_junk(s2):
-            continue
-        if topic_n and topic_n in s2.lower():
-            return s2
+    return found_topic or found_any
 
-    # Pass 3: otherwise return the first clean chunk
-    for s in chunks[:120]:
-        s2 = norm(s)
-        if not s2:
-            continue
-        if is_header_junk(s2):
-            continue
-        return s2
-
-    return ""
 
-
-
-def bullets_from_text(text: str, max_bullets: int = 6) -> List[str]:
-    sentences = re.split(r"(?<=[\.\!\?])\s+", text)
+def bullets_from_text(text: str, max_bullets: int = 6,
+                      sentences: Optional[List[str]] = None) -> List[str]:
+    if sentences is None:
+        sentences = split_sentences(text)
     bullets: List[str] = []
     seen = set()
     for s in sentences:
         s2 = s.strip()
         if not s2:
             continue
-        key = re.sub(r"\s+", " ", s2).strip().lower()
+        key = _RE_WS.sub(" ", s2).strip().lower()
         if key in seen:
             continue
         if 40 <= len(s2) <= 160:
@@ -1703,111 +2483,98 @@ def bullets_from_text(text: str, max_bullets: int = 6) -> List[str]:
 
     return bullets[:max_bullets]
 
+# Canned examples / mistakes / practice lines for a few core networking topics,
+# keyed by the category _canned_category() picks for a normalized topic.
+_CANNED: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]] = {
+    "subnet": (
+        (
+            "Example: 192.168.1.0/24 has 256 total addresses (0-255), with usable hosts typically .1 to .254 (depends on context).",
+            "Example: /26 splits a /24 into 4 subnets (each block size 64).",
+        ),
+        (
+            "Mistake: confusing the subnet mask with the network address.",
+            "Mistake: forgetting that network + broadcast addresses are usually not usable host addresses in IPv4.",
+        ),
+        (
+            "Quick check: /24 = 255.255.255.0, /16 = 255.255.0.0, /8 = 255.0.0.0.",
+            "Quick check: block size = 256 - last mask octet (when the split is in the last octet).",
+            "Quick check: usable hosts in subnet = 2^(host bits) - 2 (typical IPv4).",
+        ),
+    ),
+    "dns": (
+        (
+            "Example: A record maps a name to an IPv4 address.",
+            "Example: CNAME is an alias pointing one name to another name.",
+        ),
+        (
+            "Mistake: assuming DNS changes apply instantly (caching/TTL can delay).",
+            "Mistake: mixing up authoritative vs recursive DNS roles.",
+        ),
+        (
+            "Quick check: if a name resolves sometimes but not others, suspect caching/TTL or split-horizon DNS.",
+        ),
+    ),
+    "rfc1918": (
+        (
+            "Example private IPv4 blocks: 10.0.0.0/8, 172.16.0.0/12, 192.168.0.0/16.",
+            "Example: home routers typically use NAT so private addresses can reach the public internet.",
+        ),
+        (
+            "Mistake: thinking private IPs are routable on the public internet (they are not).",
+            "Mistake: assuming NAT is security by itself (it helps, but it’s not a firewall).",
+        ),
+        (
+            "Quick check: if the IP starts with 10., 192.168., or 172.16-172.31, it’s likely private RFC1918 space.",
+        ),
+    ),
+}
+
+def _canned_category(t: str) -> str:
+    if "subnet" in t or "cidr" in t:
+        return "subnet"
+    if "dns" in t:
+        return "dns"
+    if "rfc 1918" in t or "private ip" in t:
+        return "rfc1918"
+    return ""
+
 def structured_synthesis(topic: str, seed_text: str, source_url: str, source_label: str) -> str:
-    definition = pick_definition_sentence(topic, seed_text)
-    bullets = bullets_from_text(seed_text, max_bullets=6)
+    # split once, shared by the definition picker and the bullet builder
+    sentences = split_sentences(seed_text)
+    definition = pick_definition_sentence(topic, seed_text, sentences=sentences)
+    bullets = bullets_from_text(seed_text, max_bullets=6, sentences=sentences)
 
     # Phase 5: avoid repeating the Definition as the first bullet
     if definition:
-        dkey = re.sub(r"\s+", " ", definition).strip().lower()
-        bullets = [b for b in bullets if re.sub(r"\s+", " ", b).strip().lower() != dkey]
+        dkey = _RE_WS.sub(" ", definition).strip().lower()
+        bullets = [b for b in bullets if _RE_WS.sub(" ", b).strip().lower() != dkey]
 
     # Also drop obvious page junk lines
-    bullets = [b for b in bullets if "watch video" not in b.lower()]
+    bullets = [b for b in bullets if not _RE_JUNK_BULLET.search(b)]
 
     # Phase 5: extra cleanup for RFC/IETF style pages (remove metadata bullets)
     dsrc = get_domain(source_url)
     if ("rfc-editor.org" in dsrc) or ("ietf.org" in dsrc):
-        drop = [
-            "request for comments", "network working group", "obsoletes:", "updates:",
-            "category:", "bcp:", "std:", "status of this memo",
-        ]
-        bullets = [b for b in bullets if not any(x in b.lower() for x in drop)]
-
-
-    examples = []
-    t = normalize_topic(topic)
-    if "subnet" in t or "cidr" in t:
-        examples = [
-            "Example: 192.168.1.0/24 has 256 total addresses (0-255), with usable hosts typically .1 to .254 (depends on context).",
-            "Example: /26 splits a /24 into 4 subnets (each block size 64).",
-        ]
-    elif "dns" in t:
-        examples = [
-            "Example: A record maps a name to an IPv4 address.",
-            "Example: CNAME is an alias pointing one name to another name.",
-        ]
-    elif "rfc 1918" in t or "private ip" in t:
-        examples = [
-            "Example private IPv4 blocks: 10.0.0.0/8, 172.16.0.0/12, 192.168.0.0/16.",
-            "Example: home routers typically use NAT so private addresses can reach the public internet.",
-        ]
-
-    mistakes = []
-    if "subnet" in t or "cidr" in t:
-        mistakes = [
-            "Mistake: confusing the subnet mask with the network address.",
-            "Mistake: forgetting that network + broadcast addresses are usually not usable host addresses in IPv4.",
-        ]
-    elif "dns" in t:
-        mistakes = [
-            "Mistake: assuming DNS changes apply instantly (caching/TTL can delay).",
-            "Mistake: mixing up authoritative vs recursive DNS roles.",
-        ]
-    elif "rfc 1918" in t or "private ip" in t:
-        mistakes = [
-            "Mistake: thinking private IPs are routable on the public internet (they are not).",
-            "Mistake: assuming NAT is security by itself (it helps, but it’s not a firewall).",
-        ]
+        bullets = [b for b in bullets if not _RE_RFC_DROP.search(b)]
 
-    quick = []
-    if "subnet" in t or "cidr" in t:
-        quick = [
-            "Quick check: /24 = 255.255.255.0, /16 = 255.255.0.0, /8 = 255.0.0.0.",
-            "Quick check: block size = 256 - last mask octet (when the split is in the last octet).",
-            "Quick check: usable hosts in subnet = 2^(host bits) - 2 (typical IPv4).",
-        ]
-    elif "dns" in t:
-        quick = [
-            "Quick check: if a name resolves sometimes but not others, suspect caching/TTL or split-horizon DNS.",
-        ]
-    elif "rfc 1918" in t or "private ip" in t:
-        quick = [
-            "Quick check: if the IP starts with 10., 192.168., or 172.16-172.31, it’s likely private RFC1918 space.",
-        ]
+    examples, mistakes, quick = _CANNED.get(_canned_category(normalize_topic(topic)), ((), (), ()))
 
-    out = []
-    out.append(f"{topic.upper()}")
-    out.append("")
+    # one entry per section; sections are separated by a blank line
+    parts = [topic.upper()]
     if definition:
-        out.append("Definition:")
-        out.append(f"- {definition}")
-        out.append("")
-    out.append("Key points:")
-    for b in bullets:
-        out.append(f"- {b}")
-    out.append("")
+        parts.append(f"Definition:\n- {definition}")
+    parts.append("Key points:" + "".join(f"\n- {b}" for b in bullets))
     if examples:
-        out.append("Examples:")
-        for e in examples:
-            out.append(f"- {e}")
-        out.append("")
+        parts.append("Examples:" + "".join(f"\n- {e}" for e in examples))
     if mistakes:
-        out.append("Common mistakes:")
-        for m in mistakes:
-            out.append(f"- {m}")
-        out.append("")
+        parts.append("Common mistakes:" + "".join(f"\n- {m}" for m in mistakes))
     if quick:
-        out.append("Practice recognition:")
-        for q in quick:
-            out.append(f"- {q}")
-        out.append("")
-    out.append("Sources:")
+        parts.append("Practice recognition:" + "".join(f"\n- {q}" for q in quick))
     if source_url:
-        out.append(f"- {source_label}: {source_url}")
+        parts.append(f"Sources:\n- {source_label}: {source_url}")
     else:
-        out.append(f"- {source_label}")
-    return "\n".join(out).strip()
+        parts.append(f"Sources:\n- {source_label}")
+    return "\n\n".join(parts).strip()
 
 def expand_topic_if_needed(topic: str) -> List[str]:
     topic_n = normalize_topic(topic)
@@ -1857,8 +2624,19 @@ def ddg_lite_search(query: str, max_results: int = 10) -> List[Dict[str, str]]:
 
     # DDG Lite result links are often like:
     # href="//duckduckgo.com/l/?uddg=https%3A%2F%2Fexample.com&rut=..."
-    for mm in re.finditer(r'href="([^"]*duckduckgo\.com/l/\?[^"]*uddg=[^"]+)"', html, flags=re.I):
-        href = (mm.group(1) or "").strip()
+    # Direct hrefs are collected in the same pass as a fallback for when no
+    # redirect link decodes to a usable target.
+    direct: List[Dict[str, str]] = []
+    for mm in _RE_DDG_ANY_HREF.finditer(html):
+        href = mm.group(1)
+        if href is None:
+            if not results and len(direct) < max_results:
+                href = mm.group(2).strip()
+                if href:
+                    direct.append({"title": "", "url": href})
+            continue
+        raw = href
+        href = href.strip()
         if not href:
             continue
 
@@ -1866,31 +2644,23 @@ def ddg_lite_search(query: str, max_results: int = 10) -> List[Dict[str, str]]:
             href = "https:" + href
 
         try:
-            parsed = urllib.parse.urlparse(href)
-            qs = urllib.parse.parse_qs(parsed.query)
-            uddg = (qs.get("uddg") or [""])[0]
+            uddg = ddg_uddg_param(href)
             target = urllib.parse.unquote(uddg) if uddg else ""
         except Exception:
             target = ""
 
-        if not target:
-            continue
-        if not (target.startswith("http://") or target.startswith("https://")):
+        if not target or not (target.startswith("http://") or target.startswith("https://")):
+            # an absolute redirect href that didn't decode still counts as a direct link
+            if not results and len(direct) < max_results and _RE_HTTP_PREFIX.match(raw):
+                direct.append({"title": "", "url": raw.strip()})
             continue
 
         results.append({"title": "", "url": target})
         if len(results) >= max_results:
             break
 
-    # fallback: any direct hrefs
     if not results:
-        for href in re.findall(r'href="(https?://[^"]+)"', html, flags=re.I):
-            href = (href or "").strip()
-            if not href:
-                continue
-            results.append({"title": "", "url": href})
-            if len(results) >= max_results:
-                break
+        results = direct
 
     return results
 
@@ -2122,35 +2892,115 @@ def web_learn_topic(topic: str, forced_url: str = "", avoid_domains: Optional[Li
 # Queue logic (Phase 1)
 # -----------------------------
 
+# topic -> first queue item with that topic, for the queue list object it was built from.
+# The list itself is held so a freed list's id() can't be mistaken for a new one.
+_QUEUE_IDX: Dict[str, Any] = {"q": None, "n": -1, "by_topic": {}}
+
+def _queue_index(q: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    if _QUEUE_IDX["q"] is q and _QUEUE_IDX["n"] == len(q):
+        return _QUEUE_IDX["by_topic"]
+    by_topic: Dict[str, Dict[str, Any]] = {}
+    for item in q:
+        if isinstance(item, dict):
+            by_topic.setdefault(normalize_topic(item.get("topic", "")), item)
+    _QUEUE_IDX["q"] = q
+    _QUEUE_IDX["n"] = len(q)
+    _QUEUE_IDX["by_topic"] = by_topic
+    return by_topic
+
 def queue_find_item(q: List[Dict[str, Any]], topic: str) -> Optional[Dict[str, Any]]:
     tn = normalize_topic(topic)
-    for item in q:
-        if normalize_topic(item.get("topic", "")) == tn:
-            return item
-    return None
+    item = _queue_index(q).get(tn)
+    if item is not None and normalize_topic(item.get("topic", "")) != tn:
+        # topic was edited in place since the index was built
+        _QUEUE_IDX["q"] = None
+        item = _queue_index(q).get(tn)
+    return item
+
+def _queue_scan(q: List[Dict[str, Any]], detail: bool = False) -> Dict[str, Any]:
+    """
+    One pass over the queue: status counts, plus (detail=True) the oldest pending
+    timestamp, failure reason tallies and running items stuck for over 30 minutes.
+    """
+    counts = {"pending": 0, "running": 0, "done": 0, "failed": 0, "failed_final": 0, "other": 0}
+    oldest_pending_ts: Optional[int] = None
+    failure_reasons: Dict[str, int] = {}
+    stuck_items: List[Dict[str, Any]] = []
+    now = now_ts()
 
-def queue_stats(q: Optional[List[Dict[str, Any]]] = None) -> Dict[str, int]:
-    q = q if q is not None else load_queue()
-    counts = {"total": 0, "pending": 0, "failed": 0, "running": 0, "done": 0, "failed_final": 0, "other": 0}
-    counts["total"] = len(q)
     for item in q:
-        st = item.get("status", "pending")
+        get = item.get
+        st = get("status", "pending")
         if st in counts:
             counts[st] += 1
         else:
             counts["other"] += 1
-    return counts
+        if not detail:
+            continue
+
+        if st == "pending":
+            ts = parse_iso_to_ts(get("requested_on", ""))
+            if ts and (oldest_pending_ts is None or ts < oldest_pending_ts):
+                oldest_pending_ts = ts
+        elif st == "failed" or st == "failed_final":
+            r = (get("fail_reason") or "unknown").strip() or "unknown"
+            failure_reasons[r] = failure_reasons.get(r, 0) + 1
+        elif st == "running":
+            last = int(get("last_attempt_ts") or 0)
+            if last > 0 and (now - last) > (60 * 30):
+                stuck_items.append(item)
+
+    return {
+        "now": now,
+        "counts": counts,
+        "oldest_pending_ts": oldest_pending_ts,
+        "failure_reasons": failure_reasons,
+        "stuck_items": stuck_items,
+    }
+
+def queue_stats(q: Optional[List[Dict[str, Any]]] = None) -> Dict[str, int]:
+    q = q if q is not None else load_queue()
+    c = _queue_scan(q)["counts"]
+    return {
+        "total": len(q),
+        "pending": c["pending"],
+        "failed": c["failed"],
+        "running": c["running"],
+        "done": c["done"],
+        "failed_final": c["failed_final"],
+        "other": c["other"],
+    }
 
 def autonomy_queue_guard_ok() -> Tuple[bool, str]:
-    cfg = load_autonomy()
+    ac = load_autonomy_config()
     q = load_queue()
     stats = queue_stats(q)
-    if stats["total"] >= int(cfg.get("max_queue_size_total", 250)):
+    if stats["total"] >= ac.max_queue_size_total:
         return False, f"queue_total_limit_reached:{stats['total']}"
-    if (stats["pending"] + stats["failed"]) >= int(cfg.get("max_pending_plus_failed", 80)):
+    if (stats["pending"] + stats["failed"]) >= ac.max_pending_plus_failed:
         return False, f"queue_pending_failed_limit_reached:{stats['pending'] + stats['failed']}"
     return True, "ok"
 
+class QueueGuard:
+    """
+    autonomy_queue_guard_ok() for a run of queue_add calls. The queue only grows when an
+    add succeeds, so the guard is evaluated once and again only after note_added().
+    """
+
+    def __init__(self) -> None:
+        self._result: Optional[Tuple[bool, str]] = None
+
+    def check(self) -> Tuple[bool, str]:
+        if self._result is None:
+            self._result = autonomy_queue_guard_ok()
+        return self._result
+
+    def ok(self) -> bool:
+        return self.check()[0]
+
+    def note_added(self) -> None:
+        self._result = None
+
 def queue_add(topic: str, reason: str = "", confidence: float = 0.35, source_url: str = "") -> Tuple[bool, str]:
     topic_n = normalize_topic(topic)
     junk, why = is_junk_topic(topic_n)
@@ -2163,16 +3013,7 @@ def queue_add(topic: str, reason: str = "", confidence: float = 0.35, source_url
         st = (existing.get("status") or "").strip().lower()
         reason_l = (reason or "").lower()
 
-        deepen_signals = [
-            "low confidence",
-            "deepen",
-            "curiosity",
-            "autonomy",
-            "expanded from",
-            "learned via",
-            "answer exists but confidence is low",
-        ]
-        wants_deepen = any(sig in reason_l for sig in deepen_signals)
+        wants_deepen = _RE_DEEPEN.search(reason_l) is not None
 
         if st in ("done", "failed_final") and wants_deepen:
             existing["status"] = "pending"
@@ -2190,11 +3031,17 @@ def queue_add(topic: str, reason: str = "", confidence: float = 0.35, source_url
             save_queue(q)
             return True, "Re-queued for deeper learning."
 
+        # repeat questions land here on every message; only rewrite the queue if a field
+        # was filled in
+        changed = False
         if reason and not existing.get("reason"):
             existing["reason"] = reason
+            changed = True
         if source_url and not existing.get("source_url"):
             existing["source_url"] = source_url
-        save_queue(q)
+            changed = True
+        if changed:
+            save_queue(q)
         return False, "Already queued."
 
     item = {
@@ -2242,40 +3089,19 @@ def queue_purge_junk_pending() -> int:
     return removed
 
 def queue_health_report() -> Dict[str, Any]:
-    q = load_queue()
-    counts = {"pending": 0, "running": 0, "done": 0, "failed": 0, "failed_final": 0, "other": 0}
-    oldest_pending_ts: Optional[int] = None
-    failure_reasons: Dict[str, int] = {}
-    stuck_items: List[Dict[str, Any]] = []
-
-    now = now_ts()
-    for item in q:
-        st = item.get("status", "pending")
-        if st in counts:
-            counts[st] += 1
-        else:
-            counts["other"] += 1
-
-        if st == "pending":
-            ts = parse_iso_to_ts(item.get("requested_on", ""))
-            if ts:
-                if oldest_pending_ts is None or ts < oldest_pending_ts:
-                    oldest_pending_ts = ts
-
-        if st in ("failed", "failed_final"):
-            r = (item.get("fail_reason") or "unknown").strip() or "unknown"
-            failure_reasons[r] = failure_reasons.get(r, 0) + 1
-
-        if st == "running":
-            last = int(item.get("last_attempt_ts") or 0)
-            if last > 0 and (now - last) > (60 * 30):
-                stuck_items.append(item)
+    scan = _queue_scan(load_queue(), detail=True)
+    now = scan["now"]
+    counts = scan["counts"]
+    oldest_pending_ts = scan["oldest_pending_ts"]
+    failure_reasons = scan["failure_reasons"]
+    stuck_items = scan["stuck_items"]
 
     oldest_pending_age = None
     if oldest_pending_ts is not None:
         oldest_pending_age = human_age(now - oldest_pending_ts)
 
-    top_reasons = sorted(failure_reasons.items(), key=lambda x: x[1], reverse=True)[:5]
+    # nlargest matches sorted(..., reverse=True)[:5], ties included, without sorting every reason
+    top_reasons = heapq.nlargest(5, failure_reasons.items(), key=lambda x: x[1])
     return {
         "counts": counts,
         "oldest_pending_age": oldest_pending_age,
@@ -2287,20 +3113,30 @@ def queue_health_report() -> Dict[str, Any]:
         ],
     }
 
-def can_attempt(item: Dict[str, Any]) -> Tuple[bool, str]:
+# queue statuses that are still eligible for another attempt (and for finalization)
+_RETRYABLE_STATUSES = frozenset(("pending", "failed"))
+
+# can_attempt outcome codes (run_webqueue dispatches on these; the detail string is for logs)
+ATTEMPT_OK = 0
+ATTEMPT_JUNK = 1
+ATTEMPT_STATUS = 2
+ATTEMPT_MAX = 3
+ATTEMPT_COOLDOWN = 4
+
+def _can_attempt_code(item: Dict[str, Any]) -> Tuple[int, str]:
     topic = item.get("topic", "")
     junk, why = is_junk_topic(topic)
     if junk:
-        return False, f"junk:{why}"
+        return ATTEMPT_JUNK, f"junk:{why}"
 
     st = item.get("status", "pending")
-    if st not in ("pending", "failed"):
-        return False, f"status:{st}"
+    if st not in _RETRYABLE_STATUSES:
+        return ATTEMPT_STATUS, f"status:{st}"
 
     attempts = int(item.get("attempts") or 0)
     max_attempts = int(item.get("max_attempts") or DEFAULT_MAX_QUEUE_ATTEMPTS)
     if attempts >= max_attempts:
-        return False, "max_attempts_reached"
+        return ATTEMPT_MAX, "max_attempts_reached"
 
     last = int(item.get("last_attempt_ts") or 0)
     cd = int(item.get("cooldown_seconds") or DEFAULT_COOLDOWN_SECONDS)
@@ -2309,25 +3145,31 @@ def can_attempt(item: Dict[str, Any]) -> Tuple[bool, str]:
         if elapsed < cd:
             # MS_FORCE_BYPASS_COOLDOWN_V7_RETURN
             if str(item.get('reason','')).strip().upper().startswith('FORCE'):
-                return True, 'force'
+                return ATTEMPT_OK, 'force'
 
-            return False, f"cooldown:{human_age(cd - elapsed)}"
+            return ATTEMPT_COOLDOWN, f"cooldown:{human_age(cd - elapsed)}"
 
-    return True, "ok"
+    return ATTEMPT_OK, "ok"
 
-def mark_failed(item: Dict[str, Any], reason: str, final: bool = False) -> None:
+def can_attempt(item: Dict[str, Any]) -> Tuple[bool, str]:
+    code, why = _can_attempt_code(item)
+    return code == ATTEMPT_OK, why
+
+def mark_failed(item: Dict[str, Any], reason: str, final: bool = False,
+                iso: Optional[str] = None) -> None:
     item["status"] = "failed_final" if final else "failed"
     item["fail_reason"] = (reason or "").strip()[:200]
     if final:
-        item["completed_on"] = iso_now()
+        item["completed_on"] = iso or iso_now()
         item["worker_note"] = (item.get("worker_note") or "") + f" Finalized failure: {reason}"
 
-def mark_done(item: Dict[str, Any], note: str = "") -> None:
+def mark_done(item: Dict[str, Any], note: str = "", iso: Optional[str] = None) -> None:
     item["status"] = "done"
-    item["completed_on"] = iso_now()
+    item["completed_on"] = iso or iso_now()
     if note:
         item["worker_note"] = note
 
+@deferred_persistence()
 def run_webqueue(limit: int = 3, autoupgrade: bool = True) -> Dict[str, Any]:
     q = load_queue()
     attempted = 0
@@ -2335,35 +3177,49 @@ def run_webqueue(limit: int = 3, autoupgrade: bool = True) -> Dict[str, Any]:
     skipped = 0
     finalized = 0
 
-    cfg = load_autonomy()
-    protect_conf = float(cfg.get("protect_confidence_threshold", 0.85))
-
-    for item in q:
+    protect_conf = load_autonomy_config().protect_confidence_threshold
+    # one clock reading per phase for the run's queue bookkeeping
+    run_ts = now_ts()
+    run_iso = iso_now()
+
+    wlog = BufferedLogger(WEBQUEUE_LOG)
+    jobs: List[Tuple[Dict[str, Any], str, str, List[str]]] = []
+    # Items this run leaves pending/failed that may now be over their attempt limit.
+    # Everything the selection scan didn't reach (q[tail_start:]) is checked too.
+    finalize_candidates: List[Dict[str, Any]] = []
+    tail_start = len(q)
+    for idx, item in enumerate(q):
         if attempted >= limit:
+            tail_start = idx
             break
 
-        ok, why = can_attempt(item)
-        if not ok:
-            if why.startswith("junk:"):
-                mark_failed(item, why, final=True)
-                safe_log(WEBQUEUE_LOG, f"webqueue: finalize junk topic='{item.get('topic','')}' reason='{why}'")
+        code, why = _can_attempt_code(item)
+        if code != ATTEMPT_OK:
+            if code == ATTEMPT_JUNK:
+                mark_failed(item, why, final=True, iso=run_iso)
+                wlog.log(f"webqueue: finalize junk topic='{item.get('topic','')}' reason='{why}'")
                 finalized += 1
-            elif (why == "max_attempts_reached") and not (str(item.get('reason','')).strip().upper().startswith('FORCE')):
-                mark_failed(item, "max_attempts_reached", final=True)
-                safe_log(WEBQUEUE_LOG, f"webqueue: finalize max attempts topic='{item.get('topic','')}' attempts={item.get('attempts',0)}")
+            elif (code == ATTEMPT_MAX
+                  and not str(item.get('reason', '')).strip().upper().startswith('FORCE')):
+                mark_failed(item, "max_attempts_reached", final=True, iso=run_iso)
+                wlog.log(f"webqueue: finalize max attempts topic='{item.get('topic', '')}' "
+                         f"attempts={item.get('attempts', 0)}")
                 finalized += 1
             else:
                 skipped += 1
-                safe_log(WEBQUEUE_LOG, f"webqueue: skip topic='{item.get('topic','')}' because {why}")
+                wlog.log(f"webqueue: skip topic='{item.get('topic','')}' because {why}")
+                if code == ATTEMPT_MAX:
+                    finalize_candidates.append(item)
             continue
 
         attempted += 1
         item["status"] = "running"
         item["attempts"] = int(item.get("attempts") or 0) + 1
-        item["last_attempt_ts"] = now_ts()
+        item["last_attempt_ts"] = run_ts
 
         topic = item.get("topic", "")
-        safe_log(WEBQUEUE_LOG, f"webqueue: attempt {item['attempts']}/{item.get('max_attempts',DEFAULT_MAX_QUEUE_ATTEMPTS)} topic='{topic}'")
+        max_attempts = item.get('max_attempts', DEFAULT_MAX_QUEUE_ATTEMPTS)
+        wlog.log(f"webqueue: attempt {item['attempts']}/{max_attempts} topic='{topic}'")
 
         forced = (item.get("source_url") or "").strip()
 
@@ -2377,9 +3233,8 @@ def run_webqueue(limit: int = 3, autoupgrade: bool = True) -> Dict[str, Any]:
 
         avoid = []
         if isinstance(existing, dict):
-            for d in (existing.get("evidence_domains") or []):
-                if d and d not in avoid:
-                    avoid.append(d)
+            # dict.fromkeys: order-preserving dedupe without a list scan per domain
+            avoid = [d for d in dict.fromkeys(existing.get("evidence_domains") or []) if d]
 
 
         # MS_FORCE_RFC_BY_TOPIC_RUN_WEBQUEUE_V1
@@ -2388,16 +3243,32 @@ def run_webqueue(limit: int = 3, autoupgrade: bool = True) -> Dict[str, Any]:
                 _fu = forced_url_for_topic(topic)
                 if _fu:
                     forced = _fu
-                    safe_log(WEBQUEUE_LOG, f"webqueue: forced_url by topic='{topic}' url='{forced}' reason='{item.get('reason','')}'")
+                    wlog.log(f"webqueue: forced_url by topic='{topic}' url='{forced}' "
+                             f"reason='{item.get('reason', '')}'")
         except Exception:
             pass
 
-        ok2, answer, sources, chosen_url = web_learn_topic(topic, forced_url=forced, avoid_domains=avoid)
-
+        jobs.append((item, topic, forced, avoid))
+
+    # The fetches are independent network I/O, so run them together; results are applied
+    # below on this thread, in queue order, so knowledge/queue updates stay single-threaded.
+    results: List[Tuple[bool, str, List[str], str]] = []
+    # selection lines go out before the fetchers start logging
+    wlog.flush()
+    if jobs:
+        with ThreadPoolExecutor(max_workers=min(len(jobs), WEBQUEUE_MAX_WORKERS)) as ex:
+            futs = [ex.submit(web_learn_topic, topic, forced_url=forced, avoid_domains=avoid)
+                    for _item, topic, forced, avoid in jobs]
+            results = [f.result() for f in futs]
+        # completion stamps below should reflect when the fetches finished
+        run_iso = iso_now()
+
+    for (item, topic, _forced, _avoid), (ok2, answer, sources, chosen_url) in zip(jobs, results):
         if not ok2:
             item["status"] = "failed"
             item["fail_reason"] = "web_fetch_failed"
-            safe_log(WEBQUEUE_LOG, f"webqueue: failed topic='{topic}' reason='web_fetch_failed'")
+            wlog.log(f"webqueue: failed topic='{topic}' reason='web_fetch_failed'")
+            finalize_candidates.append(item)
             continue
 
         if chosen_url:
@@ -2410,50 +3281,71 @@ def run_webqueue(limit: int = 3, autoupgrade: bool = True) -> Dict[str, Any]:
             taught_by_user = bool(existing.get("taught_by_user", False)) if isinstance(existing, dict) else False
 
             if taught_by_user and existing_conf >= 0.75:
-                mark_done(item, note="Skipped upgrade: user-taught answer is high confidence.")
-                safe_log(WEBQUEUE_LOG, f"webqueue: done (skipped overwrite) topic='{topic}' taught_by_user=True conf={existing_conf}")
+                mark_done(item, note="Skipped upgrade: user-taught answer is high confidence.",
+                          iso=run_iso)
+                wlog.log(f"webqueue: done (skipped overwrite) topic='{topic}' taught_by_user=True "
+                         f"conf={existing_conf}")
                 continue
 
             if existing_conf >= protect_conf and isinstance(existing, dict) and (existing.get("answer") or "").strip():
-                mark_done(item, note=f"Skipped upgrade: existing confidence >= {protect_conf}.")
-                safe_log(WEBQUEUE_LOG, f"webqueue: done (skipped overwrite) topic='{topic}' conf={existing_conf} protect_threshold={protect_conf}")
+                mark_done(item, note=f"Skipped upgrade: existing confidence >= {protect_conf}.",
+                          iso=run_iso)
+                wlog.log(f"webqueue: done (skipped overwrite) topic='{topic}' conf={existing_conf} "
+                         f"protect_threshold={protect_conf}")
                 continue
 
             base_floor = max(float(item.get("current_confidence", CONF_FLOOR_UNKNOWN)), CONF_FLOOR_LEARNED)
-            existing_entry = ensure_entry_shape(existing) if isinstance(existing, dict) else ensure_entry_shape({})
+            existing_entry = evidence_working_copy(existing)
             new_conf, updated_entry = compute_weighted_confidence(existing_entry, base_floor=base_floor, sources=sources)
 
             note = "Upgraded knowledge using Phase 2 structured synthesis (Phase 5.1 weighted confidence)"
             set_knowledge(topic, answer.strip(), new_conf, sources=sources, notes=note, taught_by_user=False, _merge_evidence=updated_entry.get("evidence"))
 
             learned += 1
-            mark_done(item, note=f"{note}.")
-            safe_log(WEBQUEUE_LOG, f"webqueue: learned topic='{topic}' chosen_url='{chosen_url}' conf={new_conf:.2f} sources={sources}")
+            mark_done(item, note=f"{note}.", iso=run_iso)
+            wlog.log(f"webqueue: learned topic='{topic}' chosen_url='{chosen_url}' "
+                     f"conf={new_conf:.2f} sources={sources}")
 
             expansions = expand_topic_if_needed(topic)
             if expansions:
-                for ex in expansions:
-                    okg, whyg = autonomy_queue_guard_ok()
+                guard = QueueGuard()
+                for expansion in expansions:
+                    okg, whyg = guard.check()
                     if not okg:
-                        safe_log(WEBQUEUE_LOG, f"webqueue: expansion blocked guard='{whyg}' ex='{ex}' from='{topic}'")
+                        wlog.log(f"webqueue: expansion blocked guard='{whyg}' "
+                                 f"ex='{expansion}' from='{topic}'")
                         continue
-                    okq, _msgq = queue_add(ex, reason=f"Expanded from '{topic}'", confidence=0.35)
+                    okq, _msgq = queue_add(expansion, reason=f"Expanded from '{topic}'",
+                                           confidence=0.35)
                     if okq:
-                        safe_log(WEBQUEUE_LOG, f"webqueue: expanded queued topic='{ex}' from='{topic}'")
+                        guard.note_added()
+                        wlog.log(f"webqueue: expanded queued topic='{expansion}' from='{topic}'")
         else:
-            mark_done(item, note="Fetched (autoupgrade disabled).")
-            safe_log(WEBQUEUE_LOG, f"webqueue: done topic='{topic}' autoupgrade=False")
-
-    for item in q:
-        if item.get("status") in ("pending", "failed"):
-            attempts = int(item.get("attempts") or 0)
-            max_attempts = int(item.get("max_attempts") or DEFAULT_MAX_QUEUE_ATTEMPTS)
-            if attempts >= max_attempts:
-                mark_failed(item, "max_attempts_reached", final=True)
-                finalized += 1
+            mark_done(item, note="Fetched (autoupgrade disabled).", iso=run_iso)
+            wlog.log(f"webqueue: done topic='{topic}' autoupgrade=False")
+
+    # Items the scan handled otherwise can't qualify: junk/max were finalized above, done
+    # items aren't pending/failed, and cooldown skips are below their limit.
+    finalize_candidates.extend(q[tail_start:])
+    for item in finalize_candidates:
+        get = item.get
+        if get("status") not in _RETRYABLE_STATUSES:
+            continue
+        # stored counters are ints once load_queue has filled them in; only coerce strays
+        attempts = get("attempts") or 0
+        if type(attempts) is not int:
+            attempts = int(attempts)
+        max_attempts = get("max_attempts") or DEFAULT_MAX_QUEUE_ATTEMPTS
+        if type(max_attempts) is not int:
+            max_attempts = int(max_attempts)
+        if attempts >= max_attempts:
+            mark_failed(item, "max_attempts_reached", final=True, iso=run_iso)
+            finalized += 1
 
     save_queue(q)
-    safe_log(WEBQUEUE_LOG, f"run_webqueue: learned={learned} attempted={attempted} skipped={skipped} finalized={finalized} limit={limit}")
+    wlog.log(f"run_webqueue: learned={learned} attempted={attempted} skipped={skipped} "
+             f"finalized={finalized} limit={limit}")
+    wlog.flush()
     return {"learned": learned, "attempted": attempted, "skipped": skipped, "finalized": finalized, "limit": limit}
 
 # -----------------------------
@@ -2465,37 +3357,34 @@ def curiosity_tick(limit: int = 3) -> Dict[str, Any]:
     items = []
     for topic, entry in k.items():
         junk2, why2 = is_junk_topic(topic)
-        if junk2:
-            continue
-        junk2, why2 = is_junk_topic(topic)
-        if junk2:
-            continue
-        junk2, why2 = is_junk_topic(topic)
-        if junk2:
-            continue
-        junk2, why2 = is_junk_topic(topic)
         if junk2:
             continue
         if not isinstance(entry, dict):
             continue
         conf = float(entry.get("confidence", 0.0))
         upd = parse_iso_to_ts(entry.get("updated", "")) or 0
-        items.append((conf, upd, topic))
-    items.sort(key=lambda x: (x[0], x[1]))
+        # position breaks (conf, upd) ties in store order, as the stable sort did
+        items.append((conf, upd, len(items), topic))
+    # Only the lowest few are ever visited (queue_add may refuse some), so pop them
+    # off a heap lazily instead of sorting the whole store.
+    heapq.heapify(items)
 
     queued = 0
     considered = 0
-    for conf, _upd, topic in items:
+    guard = QueueGuard()
+    while items:
         if queued >= limit:
             break
+        conf, _upd, _pos, topic = heapq.heappop(items)
         considered += 1
-        okg, whyg = autonomy_queue_guard_ok()
+        okg, whyg = guard.check()
         if not okg:
             safe_log(CURIOSITY_LOG, f"curiosity: blocked by guard='{whyg}'")
             break
         ok, _msg = queue_add(topic, reason="Curiosity: low confidence topic", confidence=max(conf, 0.35))
         if ok:
             queued += 1
+            guard.note_added()
 
     safe_log(CURIOSITY_LOG, f"curiosity: considered={considered} queued={queued} limit={limit}")
     return {"considered": considered, "queued": queued, "limit": limit}
@@ -2504,40 +3393,31 @@ def curiosity_tick(limit: int = 3) -> Dict[str, Any]:
 # Phase 4: Controlled autonomy
 # -----------------------------
 
-def autonomy_pick_daily_topics(cfg: Dict[str, Any]) -> List[str]:
-    dt = cfg.get("daily_themes") or {}
-    if not isinstance(dt, dict):
-        dt = {}
-    key = weekday_key()
-    topics = dt.get(key) or []
-    if not isinstance(topics, list):
-        topics = []
-    return [normalize_topic(t) for t in topics if normalize_topic(t)]
-
-def autonomy_pick_weekly_bucket(cfg: Dict[str, Any]) -> List[str]:
-    buckets = cfg.get("weekly_themes") or []
-    if not isinstance(buckets, list) or not buckets:
+def autonomy_pick_daily_topics(ac: AutonomyConfig) -> List[str]:
+    return list(ac.daily_themes_by_weekday[datetime.datetime.now().weekday()])
+
+def autonomy_pick_weekly_bucket(ac: AutonomyConfig) -> List[str]:
+    if not ac.weekly_themes:
         return []
 
     k = load_knowledge()
+    # answered topics among those the buckets mention (buckets often share topics, and
+    # the knowledge store is usually much larger than the buckets, so don't scan all of it)
+    covered = set()
+    for t in {t for bnorm in ac.weekly_themes for t in bnorm}:
+        e = k.get(t)
+        if isinstance(e, dict) and (e.get("answer") or "").strip():
+            covered.add(t)
+
     best_bucket = None
     best_score = None
-    for bucket in buckets:
-        if not isinstance(bucket, list):
-            continue
-        bnorm = [normalize_topic(x) for x in bucket if normalize_topic(x)]
-        if not bnorm:
-            continue
-        covered = 0
-        for t in bnorm:
-            if t in k and isinstance(k[t], dict) and (k[t].get("answer") or "").strip():
-                covered += 1
-        score = covered
+    for bnorm in ac.weekly_themes:
+        score = sum(1 for t in bnorm if t in covered)
         if best_score is None or score < best_score:
             best_score = score
             best_bucket = bnorm
 
-    return best_bucket or []
+    return list(best_bucket or [])
 
 def autonomy_seed_topics(topics: List[str], reason: str, limit: int) -> Dict[str, Any]:
     added = 0
@@ -2545,10 +3425,11 @@ def autonomy_seed_topics(topics: List[str], reason: str, limit: int) -> Dict[str
     blocked = 0
     msgs = []
 
+    guard = QueueGuard()
     for t in topics:
         if added >= limit:
             break
-        okg, whyg = autonomy_queue_guard_ok()
+        okg, whyg = guard.check()
         if not okg:
             blocked += 1
             msgs.append(f"blocked:{whyg}")
@@ -2557,45 +3438,47 @@ def autonomy_seed_topics(topics: List[str], reason: str, limit: int) -> Dict[str
         ok, msg = queue_add(t, reason=reason, confidence=0.35)
         if ok:
             added += 1
+            guard.note_added()
         else:
             skipped += 1
 
     return {"added": added, "skipped": skipped, "blocked": blocked, "notes": msgs}
 
+@deferred_persistence()
 def autonomy_run_daily(force: bool = False) -> Dict[str, Any]:
-    cfg = load_autonomy()
-    if not bool(cfg.get("enabled", True)):
+    ac = load_autonomy_config()
+    if not ac.enabled:
         return {"ok": False, "msg": "Autonomy is disabled."}
 
     ymd = today_ymd()
-    if (not force) and cfg.get("last_daily_ymd") == ymd:
+    if (not force) and ac.last_daily_ymd == ymd:
         return {"ok": True, "msg": f"Daily autonomy already ran today ({ymd})."}
 
-    topics = autonomy_pick_daily_topics(cfg)
+    topics = autonomy_pick_daily_topics(ac)
     if not topics:
         return {"ok": False, "msg": "No daily topics configured."}
 
-    limit = int(cfg.get("daily_seed_limit", 3))
-    res_seed = autonomy_seed_topics(topics, reason="Autonomy daily seed", limit=limit)
+    res_seed = autonomy_seed_topics(topics, reason="Autonomy daily seed", limit=ac.daily_seed_limit)
 
-    learn_limit = int(cfg.get("daily_autolearn_limit", 2))
     res_learn = {"learned": 0, "attempted": 0}
-    if learn_limit > 0:
-        res_learn = run_webqueue(limit=learn_limit, autoupgrade=True)
+    if ac.daily_autolearn_limit > 0:
+        res_learn = run_webqueue(limit=ac.daily_autolearn_limit, autoupgrade=True)
 
+    cfg = load_autonomy()
     cfg["last_daily_ymd"] = ymd
     save_autonomy(cfg)
 
     safe_log(AUTONOMY_LOG, f"daily: ymd={ymd} seed={res_seed} learn={res_learn}")
     return {"ok": True, "msg": f"Daily autonomy ran ({ymd}).", "seed": res_seed, "learn": res_learn}
 
+@deferred_persistence()
 def autonomy_run_weekly(force: bool = False) -> Dict[str, Any]:
-    cfg = load_autonomy()
-    if not bool(cfg.get("enabled", True)):
+    ac = load_autonomy_config()
+    if not ac.enabled:
         return {"ok": False, "msg": "Autonomy is disabled."}
 
     ymd = today_ymd()
-    last = (cfg.get("last_weekly_ymd") or "").strip()
+    last = ac.last_weekly_ymd.strip()
     if (not force) and last:
         try:
             last_dt = datetime.datetime.strptime(last, "%Y-%m-%d")
@@ -2605,18 +3488,18 @@ def autonomy_run_weekly(force: bool = False) -> Dict[str, Any]:
         except Exception:
             pass
 
-    bucket = autonomy_pick_weekly_bucket(cfg)
+    bucket = autonomy_pick_weekly_bucket(ac)
     if not bucket:
         return {"ok": False, "msg": "No weekly topics configured."}
 
-    limit = int(cfg.get("weekly_seed_limit", 6))
-    res_seed = autonomy_seed_topics(bucket, reason="Autonomy weekly deep dive", limit=limit)
+    res_seed = autonomy_seed_topics(bucket, reason="Autonomy weekly deep dive",
+                                    limit=ac.weekly_seed_limit)
 
-    learn_limit = int(cfg.get("weekly_autolearn_limit", 3))
     res_learn = {"learned": 0, "attempted": 0}
-    if learn_limit > 0:
-        res_learn = run_webqueue(limit=learn_limit, autoupgrade=True)
+    if ac.weekly_autolearn_limit > 0:
+        res_learn = run_webqueue(limit=ac.weekly_autolearn_limit, autoupgrade=True)
 
+    cfg = load_autonomy()
     cfg["last_weekly_ymd"] = ymd
     save_autonomy(cfg)
 
@@ -2633,6 +3516,20 @@ def split_pipe(cmd: str) -> Tuple[str, str]:
     left, right = cmd.split("|", 1)
     return left.strip(), right.strip()
 
+def _as_count(n: Any) -> int:
+    try:
+        return int(n or 0)
+    except (TypeError, ValueError):
+        return 0
+
+def _add_counts(a: Any, b: Any) -> Dict[str, int]:
+    # per-key sum of two count dicts; non-dicts count as empty, unparseable counts as 0
+    out = dict(a) if isinstance(a, dict) else {}
+    if isinstance(b, dict):
+        for key, n in b.items():
+            out[key] = _as_count(out.get(key)) + _as_count(n)
+    return out
+
 def cmd_merge(arg: str) -> None:
     left, right = split_pipe(arg)
     frm = normalize_topic(left.replace("/merge", "", 1).strip())
@@ -2653,23 +3550,19 @@ def cmd_merge(arg: str) -> None:
     to_entry = ensure_entry_shape(k.get(to, {})) if isinstance(k.get(to, {}), dict) else ensure_entry_shape({"answer": str(k.get(to, ""))})
 
     merged = dict(to_entry)
+    now = iso_now()
 
     if (not merged.get("answer")) and from_entry.get("answer"):
         merged["answer"] = from_entry.get("answer")
 
     if to_entry.get("answer") and from_entry.get("answer") and to_entry.get("answer") != from_entry.get("answer"):
-        merged["notes"] = (merged.get("notes", "") + "\n\n" + f"Merged from '{frm}' on {iso_now()}:\n" + from_entry.get("answer", "")).strip()
+        merged["notes"] = (merged.get("notes", "") + "\n\n" + f"Merged from '{frm}' on {now}:\n"
+                           + from_entry.get("answer", "")).strip()
 
     merged["confidence"] = max(float(to_entry.get("confidence", 0.0)), float(from_entry.get("confidence", 0.0)))
 
-    srcs = []
-    for s in (to_entry.get("sources") or []):
-        if s not in srcs:
-            srcs.append(s)
-    for s in (from_entry.get("sources") or []):
-        if s not in srcs:
-            srcs.append(s)
-    merged["sources"] = srcs
+    merged["sources"] = list(dict.fromkeys((to_entry.get("sources") or [])
+                                           + (from_entry.get("sources") or [])))
 
     # Merge evidence safely (Phase 5.1): keep the richer one
     ev_from = from_entry.get("evidence") if isinstance(from_entry.get("evidence"), dict) else None
@@ -2679,28 +3572,21 @@ def cmd_merge(arg: str) -> None:
         if ev_to:
             merged["evidence"] = ev_to
         if ev_from:
-            merged["evidence"] = merged.get("evidence") or {}
-            # soft merge counts
-            try:
-                merged_ev = merged.get("evidence") if isinstance(merged.get("evidence"), dict) else {}
-                merged_ev.setdefault("domains", {})
-                merged_ev.setdefault("buckets", {})
-                if isinstance(ev_from.get("domains"), dict):
-                    for d, meta in ev_from["domains"].items():
-                        if d not in merged_ev["domains"]:
-                            merged_ev["domains"][d] = meta
-                if isinstance(ev_from.get("buckets"), dict):
-                    for b, n in ev_from["buckets"].items():
-                        merged_ev["buckets"][b] = int(merged_ev["buckets"].get(b) or 0) + int(n or 0)
-                merged["evidence"] = merged_ev
-            except Exception:
-                pass
+            # soft merge: keep the target's domain meta, add bucket counts
+            merged_ev = merged.get("evidence") if isinstance(merged.get("evidence"), dict) else {}
+            domains = merged_ev.get("domains") if isinstance(merged_ev.get("domains"), dict) else {}
+            if isinstance(ev_from.get("domains"), dict):
+                for d, meta in ev_from["domains"].items():
+                    domains.setdefault(d, meta)
+            merged_ev["domains"] = domains
+            merged_ev["buckets"] = _add_counts(merged_ev.get("buckets"), ev_from.get("buckets"))
+            merged["evidence"] = merged_ev
 
     merged["taught_by_user"] = bool(to_entry.get("taught_by_user", False) or from_entry.get("taught_by_user", False))
-    merged["updated"] = iso_now()
+    merged["updated"] = now
 
     k[to] = merged
-    save_knowledge(k)
+    save_knowledge(k, checkpoint=True)
 
     a = load_aliases()
     a[frm] = to
@@ -2714,27 +3600,25 @@ def cmd_dedupe(_arg: str) -> None:
         print("No knowledge entries to dedupe.")
         return
 
+    # grouped in memory: the store is already loaded, and a persisted index would be stale
+    # after nearly every write (webqueue/autonomy runs), costing a rebuild plus a file write
     bucket: Dict[str, List[str]] = {}
     for topic, entry in k.items():
-        junk2, why2 = is_junk_topic(topic)
-        if junk2:
-            continue
-        if not isinstance(entry, dict):
+        if is_junk_topic(topic)[0] or not isinstance(entry, dict):
             continue
         ans = (entry.get("answer") or "").strip()
-        if not ans:
-            continue
-        key = ans
-        bucket.setdefault(key, []).append(topic)
+        if ans:
+            bucket.setdefault(ans, []).append(topic)
 
-    dups = [(ans, topics) for ans, topics in bucket.items() if len(topics) > 1]
+    dups = [topics for topics in bucket.values() if len(topics) > 1]
     if not dups:
         print("No exact duplicate answers found.")
         return
 
     print("Exact duplicate answers found (safe suggestions):")
     shown = 0
-    for _ans, topics in sorted(dups, key=lambda x: len(x[1]), reverse=True):
+    # only the first 10 groups are printed (the 11th triggers the "more" notice)
+    for topics in heapq.nlargest(11, dups, key=len):
         shown += 1
         if shown > 10:
             print("...more duplicates exist. Run /dedupe again after cleaning some.")
@@ -2784,8 +3668,9 @@ def cmd_prune(arg: str) -> None:
                 if (not ans) and (not notes) and (not srcs) and (not taught):
                     shadows.append(topic)
 
-    empty = sorted(set(empty))
-    shadows = sorted(set(shadows))
+    # topics are dict keys, so both lists are already duplicate-free; just order them
+    empty.sort()
+    shadows.sort()
 
     print("Prune report:")
     print(f"- empty candidates: {len(empty)}")
@@ -2813,9 +3698,14 @@ def cmd_prune(arg: str) -> None:
             del k[t]
             removed += 1
 
-    save_knowledge(k)
+    save_knowledge(k, checkpoint=True)
     print(f"Applied prune. Removed {removed} entries (safe set only).")
 
+def cmd_clearcache() -> None:
+    ttl_cache_clear(WIKI_CACHE_PATH)
+    ttl_cache_clear(WEB_CACHE_PATH)
+    print("Cleared the Wikipedia and web lookup caches.")
+
 def cmd_selftest(_arg: str) -> None:
     results = []
     ok_all = True
@@ -2984,6 +3874,7 @@ def print_help() -> None:
 /merge <from> | <to>
 /dedupe
 /prune [dryrun|apply]
+/clearcache            (drop cached Wikipedia/search/page lookups)
 /selftest
 
 # Phase 4 controlled autonomy:
@@ -3048,8 +3939,8 @@ def cmd_import(path: str) -> None:
         print("File not found.")
         return
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = _json_loads(f.read())
     except Exception:
         print("Import failed (not valid JSON).")
         return
@@ -3063,13 +3954,22 @@ def cmd_import(path: str) -> None:
         if not t:
             continue
         if isinstance(entry, dict):
-            k[t] = ensure_entry_shape(entry)
+            k[t] = shape_imported_entry(entry)
         else:
             k[t] = ensure_entry_shape({"answer": str(entry), "confidence": 0.5})
         merged += 1
-    save_knowledge(k)
+    save_knowledge(k, checkpoint=True)
     print(f"Imported {merged} entries.")
 
+def _parse_json_file(path: str) -> Any:
+    # unreadable/invalid files parse to None
+    try:
+        with open(path, "rb") as f:
+            return _json_loads(f.read())
+    except Exception:
+        return None
+
+@deferred_persistence()
 def cmd_importfolder(folder: str) -> None:
     folder = folder.replace("/importfolder", "", 1).strip()
     if not folder:
@@ -3081,24 +3981,24 @@ def cmd_importfolder(folder: str) -> None:
     files = [os.path.join(folder, f) for f in os.listdir(folder) if f.lower().endswith(".json")]
     files.sort()
     count = 0
+    k = load_knowledge()
     for fp in files:
+        data = _parse_json_file(fp)
         try:
-            with open(fp, "r", encoding="utf-8") as f:
-                data = json.load(f)
             if isinstance(data, dict):
-                k = load_knowledge()
                 for topic, entry in data.items():
                     t = normalize_topic(topic)
                     if not t:
                         continue
                     if isinstance(entry, dict):
-                        k[t] = ensure_entry_shape(entry)
+                        k[t] = shape_imported_entry(entry)
                     else:
                         k[t] = ensure_entry_shape({"answer": str(entry), "confidence": 0.5})
-                save_knowledge(k)
                 count += 1
         except Exception:
             continue
+    if count:
+        save_knowledge(k, checkpoint=True)
     print(f"Imported {count} JSON files.")
 
 def cmd_export() -> None:
@@ -3106,7 +4006,8 @@ def cmd_export() -> None:
     ensure_dirs()
     ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     out = os.path.join(EXPORTS_DIR, f"knowledge_export_{ts}.json")
-    atomic_write_json(out, k)
+    clean = {t: without_shape_markers(e) if isinstance(e, dict) else e for t, e in k.items()}
+    atomic_write_json(out, clean)
     print(f"Exported to {out}")
 
 def cmd_queue() -> None:
@@ -3159,36 +4060,16 @@ def cmd_confidence(arg: str) -> None:
         print("No entry yet for that topic. Teach it first.")
         return
 
-    print(f"{resolved} confidence: {entry.get('confidence',0.0)} (updated {entry.get('updated','')})")
-
-    # Phase 5.1: prefer the new stored fields (these are the source of truth)
-    domains = entry.get("evidence_domains")
-    buckets = entry.get("evidence_buckets")
-    reinf = entry.get("reinforcement")
+    v = EntryView.of(entry)
+    print(f"{resolved} confidence: {v.confidence} (updated {v.updated})")
 
-    # Back-compat fallback: some older entries may only have entry["evidence"]
-    if (domains is None) or (buckets is None) or (reinf is None):
-        ev = entry.get("evidence") or {}
-        if domains is None:
-            domains = ev.get("domains")
-        if buckets is None:
-            buckets = ev.get("buckets")
-        if reinf is None:
-            reinf = ev.get("reinforcement")
-
-    if not isinstance(domains, list):
-        domains = []
-    if not isinstance(buckets, dict):
-        buckets = {}
-    if not isinstance(reinf, dict):
-        reinf = {"count": 0, "last": entry.get("updated", "")}
-
-    print(f"- evidence domains: {len(domains)}")
-    if buckets:
+    print(f"- evidence domains: {len(v.domains)}")
+    if v.buckets:
         print("- evidence buckets:")
-        for k, v in sorted(buckets.items(), key=lambda x: (-int(x[1]), str(x[0]))):
-            print(f"  - {k}: {v}")
-    print(f"- reinforcement: count={int(reinf.get('count',0) or 0)} last={reinf.get('last','')}")
+        for b, n in sorted(v.buckets.items(), key=lambda x: (-int(x[1]), str(x[0]))):
+            print(f"  - {b}: {n}")
+    reinf_count = int(v.reinf.get('count', 0) or 0)
+    print(f"- reinforcement: count={reinf_count} last={v.reinf.get('last', '')}")
 
 
 def cmd_confirm(arg: str) -> None:
@@ -3211,20 +4092,19 @@ def cmd_confirm(arg: str) -> None:
         return
 
     entry = ensure_entry_shape(entry)
+    v = EntryView.of(entry)
+    now = iso_now()
 
-    confirmed = entry.get("confirmed")
-    if not isinstance(confirmed, dict):
-        confirmed = {"count": 0, "last": ""}
-
+    confirmed = v.confirmed
     confirmed["count"] = int(confirmed.get("count") or 0) + 1
-    confirmed["last"] = iso_now()
+    confirmed["last"] = now
     entry["confirmed"] = confirmed
 
     # bump confidence: +0.05 per confirm, capped
-    conf0 = float(entry.get("confidence", 0.0))
+    conf0 = float(v.confidence)
     conf1 = min(conf0 + 0.05, 0.99)
     entry["confidence"] = max(conf0, conf1)
-    entry["updated"] = iso_now()
+    entry["updated"] = now
 
     # save
     k[resolved] = entry
@@ -3241,20 +4121,13 @@ def cmd_lowest(arg: str) -> None:
             n = int(n_str)
         except Exception:
             n = 10
+    if n < 0:
+        n = 10  # a negative slice would list everything except the last rows
     k = load_knowledge()
-    items = []
-    for topic, entry in k.items():
-        junk2, why2 = is_junk_topic(topic)
-        if junk2:
-            continue
-        if not isinstance(entry, dict):
-            continue
-        conf = float(entry.get("confidence", 0.0))
-        items.append((conf, topic))
-    items.sort(key=lambda x: x[0])
-    print(f"Lowest confidence (top {n}):")
-    for conf, topic in items[:n]:
-        print(f"- {topic}: {conf}")
+    # one write for the whole listing instead of a print per row
+    lines = [f"Lowest confidence (top {n}):"]
+    lines.extend(f"- {topic}: {conf}" for conf, _pos, topic in conf_index(k)[:n])
+    print("\n".join(lines))
 
 
 
@@ -3270,6 +4143,8 @@ def cmd_lowestdomains(arg: str) -> None:
             n = int(n_str)
         except Exception:
             n = 10
+    if n < 0:
+        n = 10  # a negative slice would list everything except the last rows
 
     k = load_knowledge()
     items = []
@@ -3280,14 +4155,13 @@ def cmd_lowestdomains(arg: str) -> None:
         if not isinstance(entry, dict):
             continue
         conf = float(entry.get("confidence", 0.0) or 0.0)
-        domains = entry.get("evidence_domains") or []
-        dcount = len(set([(d or "").lower().strip() for d in domains if (d or "").strip()]))
+        dcount = entry_domain_count(entry)
         items.append((conf, dcount, topic))
 
-    items.sort(key=lambda x: (x[0], x[1], x[2]))
-    print(f"Lowest confidence w/ domains (top {n}):")
-    for conf, dcount, topic in items[:n]:
-        print(f"- {topic}: {conf:.2f} (domains={dcount})")
+    top = heapq.nsmallest(n, items)
+    lines = [f"Lowest confidence w/ domains (top {n}):"]
+    lines.extend(f"- {topic}: {conf:.2f} (domains={dcount})" for conf, dcount, topic in top)
+    print("\n".join(lines))
 
 def cmd_needsources(arg: str) -> None:
     """
@@ -3310,19 +4184,18 @@ def cmd_needsources(arg: str) -> None:
             continue
         if not isinstance(entry, dict):
             continue
-        domains = entry.get("evidence_domains") or []
-        dcount = len(set([(d or "").lower().strip() for d in domains if (d or "").strip()]))
+        dcount = entry_domain_count(entry)
         conf = float(entry.get("confidence", 0.0) or 0.0)
         if dcount < n:
             rows.append((topic, conf, dcount))
 
-    rows.sort(key=lambda x: (x[2], x[1], x[0]))  # fewest domains, then lowest confidence, then topic
+    # fewest domains, then lowest confidence, then topic; only the first 50 are shown
+    top = heapq.nsmallest(50, rows, key=lambda x: (x[2], x[1], x[0]))
     print(f"Topics needing sources (< {n} domains):")
-    if not rows:
+    if not top:
         print("- none")
         return
-    for topic, conf, dcount in rows[:50]:
-        print(f"- {topic}: {conf:.2f} (domains={dcount})")
+    print("\n".join(f"- {topic}: {conf:.2f} (domains={dcount})" for topic, conf, dcount in top))
 
 
 
@@ -3356,18 +4229,49 @@ def cmd_debugsources(arg: str) -> None:
             sc = source_score(url, title)
             rows.append((sc, url, title))
 
-        rows.sort(key=lambda x: x[0], reverse=True)
+        rows = heapq.nlargest(8, rows, key=lambda x: x[0])
+        if not rows:
+            return
 
-        for sc, url, title in rows[:8]:
-            ok, text, reason = fetch_page_text_debug(url)
+        # fetch the candidates concurrently; map() keeps the results in score order
+        with ThreadPoolExecutor(max_workers=len(rows)) as ex:
+            fetched = list(ex.map(fetch_page_text_debug, [url for _sc, url, _title in rows]))
+
+        for (sc, url, title), (ok, text, reason) in zip(rows, fetched):
             dom = get_domain(url)
-            tlen = len(re.sub(r"\s+"," ", (text or "")).strip()) if text else 0
+            # length of the whitespace-collapsed text, counted without building it:
+            # str.split() and \s agree on what whitespace is
+            words = text.split() if text else []
+            tlen = sum(map(len, words)) + max(len(words) - 1, 0)
             print(f"- score={sc:4d} ok={ok} reason={reason:12s} len={tlen:5d} domain={dom} url={url}")
 
     show("NORMAL", q1)
     print("")
     show("WIKI_AVOID", q2)
 
+_REPAIR_RFC_HITS = ("rfc-editor.org", "ietf.org", "iana.org")
+# treat major vendor docs as vendor bucket
+_REPAIR_VENDOR_HITS = (
+    "cisco.com", "juniper.net", "microsoft.com", "learn.microsoft.com", "cloudflare.com",
+    "akamai.com", "redhat.com", "ibm.com", "oracle.com",
+)
+
+# /repair_evidence's bucket rules; a store repeats the same few domains across topics
+@functools.lru_cache(maxsize=8192)
+def repair_bucket(d: str) -> str:
+    d = (d or "").lower().strip()
+    if not d:
+        return "other"
+    if any(v in d for v in _REPAIR_RFC_HITS):
+        return "rfc"
+    if d.endswith((".gov", ".edu")) or "nist.gov" in d:
+        return "gov_edu"
+    if "wikipedia.org" in d:
+        return "wiki"
+    if any(v in d for v in _REPAIR_VENDOR_HITS):
+        return "vendor"
+    return "other"
+
 def cmd_repair_evidence(arg: str) -> None:
     """
     /repair_evidence
@@ -3378,34 +4282,19 @@ def cmd_repair_evidence(arg: str) -> None:
     """
     k = load_knowledge()
 
-    def _bucket(d: str) -> str:
-        d = (d or "").lower().strip()
-        if not d:
-            return "other"
-        if "rfc-editor.org" in d or "ietf.org" in d or "iana.org" in d:
-            return "rfc"
-        if d.endswith(".gov") or d.endswith(".edu") or "nist.gov" in d:
-            return "gov_edu"
-        if "wikipedia.org" in d:
-            return "wiki"
-        # treat major vendor docs as vendor bucket
-        vendor_hits = ["cisco.com", "juniper.net", "microsoft.com", "learn.microsoft.com", "cloudflare.com", "akamai.com", "redhat.com", "ibm.com", "oracle.com"]
-        if any(v in d for v in vendor_hits):
-            return "vendor"
-        return "other"
     removed = 0
     backfilled = 0
     clamped = 0
     touched = 0
 
-    for topic in list(k.keys()):
-        junk, why = is_junk_topic(topic)
-        if junk:
-            del k[topic]
-            removed += 1
-            continue
+    now = iso_now()
+
+    # drop junk first so the main pass can walk the store without a key snapshot
+    for topic in [t for t in k if is_junk_topic(t)[0]]:
+        del k[topic]
+        removed += 1
 
-        entry = k.get(topic)
+    for topic, entry in k.items():
         if not isinstance(entry, dict):
             continue
 
@@ -3419,7 +4308,9 @@ def cmd_repair_evidence(arg: str) -> None:
         domains = entry.get("evidence_domains")
         if not isinstance(domains, list):
             domains = []
-        domains_clean = set([(d or "").lower().strip() for d in domains if (d or "").strip()])
+        # normalize the stored list once; the clamp check below reuses this count
+        own_domains = set([(d or "").lower().strip() for d in domains if (d or "").strip()])
+        domains_clean = set(own_domains)
 
         sources = entry.get("sources") or []
         if isinstance(sources, list) and sources:
@@ -3434,12 +4325,13 @@ def cmd_repair_evidence(arg: str) -> None:
 
         if len(domains_clean) != len(domains):
             entry["evidence_domains"] = sorted(domains_clean)
+            own_domains = domains_clean
             # also backfill buckets if possible
             buckets = entry.get("evidence_buckets")
             if not isinstance(buckets, dict):
                 buckets = {}
             for d in domains_clean:
-                b = _bucket(d)
+                b = repair_bucket(d)
                 buckets[b] = int(buckets.get(b, 0) or 0) + 1
             entry["evidence_buckets"] = buckets
             backfilled += 1
@@ -3451,18 +4343,17 @@ def cmd_repair_evidence(arg: str) -> None:
         except Exception:
             conf = 0.0
         confirm_count = int(confirmed.get("count") or 0)
-        dcount = len(set([(d or "").lower().strip() for d in (entry.get("evidence_domains") or []) if (d or "").strip()]))
+        dcount = len(own_domains)
+        entry["_dcount"] = dcount
 
         if confirm_count <= 0 and dcount < 2 and conf > 0.92:
             entry["confidence"] = 0.92
-            entry["updated"] = iso_now()
+            entry["updated"] = now
             clamped += 1
             touched += 1
 
-        k[topic] = entry
-
     if removed or backfilled or clamped:
-        save_knowledge(k)
+        save_knowledge(k, checkpoint=True)
 
     print("Repair complete:")
     print(f"- removed junk topics: {removed}")
@@ -3509,11 +4400,12 @@ def cmd_suggest() -> None:
     k = load_knowledge()
     a = load_aliases()
 
-    pending = [i for i in q if i.get("status") == "pending"]
-    if not pending:
+    # only the newest pending item is used; scan from the end instead of collecting all
+    last = next((i for i in reversed(q) if i.get("status") == "pending"), None)
+    if last is None:
         print("No pending topics to suggest for.")
         return
-    topic = pending[-1].get("topic", "")
+    topic = last.get("topic", "")
     sug = suggest_alias(topic, k, a)
     if sug and sug != topic:
         print(f"Suggestion: /alias {topic} | {sug}")
@@ -3525,11 +4417,12 @@ def cmd_accept() -> None:
     k = load_knowledge()
     a = load_aliases()
 
-    pending = [i for i in q if i.get("status") == "pending"]
-    if not pending:
+    # only the newest pending item is used; scan from the end instead of collecting all
+    last = next((i for i in reversed(q) if i.get("status") == "pending"), None)
+    if last is None:
         print("No pending topics to accept for.")
         return
-    topic = pending[-1].get("topic", "")
+    topic = last.get("topic", "")
     sug = suggest_alias(topic, k, a)
     if not sug or sug == topic:
         print("No suggestion available.")
@@ -3577,6 +4470,7 @@ def add_pending_promotion(topic: str, why: str = "") -> None:
     p.append({"topic": topic_n, "why": why or "", "added": iso_now()})
     save_pending_promotions(p)
 
+@deferred_persistence()
 def cmd_weblearn(arg: str) -> None:
     topic = normalize_topic(arg.replace("/weblearn", "", 1).strip())
     if not topic:
@@ -3592,44 +4486,40 @@ def cmd_weblearn(arg: str) -> None:
     e0 = k0.get(topic)
     avoid = []
     if isinstance(e0, dict):
-        for d in (e0.get("evidence_domains") or []):
-            if d and d not in avoid:
-                avoid.append(d)
+        # dict.fromkeys: order-preserving dedupe without a list scan per domain
+        avoid = [d for d in dict.fromkeys(e0.get("evidence_domains") or []) if d]
 
     ok, answer, sources, _chosen_url = web_learn_topic(topic, avoid_domains=avoid)
 
     # Phase 5.1: merge sources with existing
     if isinstance(e0, dict):
         existing_sources = e0.get("sources") or []
-        merged = []
-        for s in existing_sources + (sources or []):
-            s2 = (s or "").strip()
-            if s2 and s2 not in merged:
-                merged.append(s2)
-        sources = merged
+        unique = dict.fromkeys((s or "").strip() for s in existing_sources + (sources or []))
+        sources = [s2 for s2 in unique if s2]
     if not ok:
         print(answer)
         return
 
     k = load_knowledge()
     existing = k.get(topic)
-    existing_entry = ensure_entry_shape(existing) if isinstance(existing, dict) else ensure_entry_shape({})
+    existing_entry = evidence_working_copy(existing)
     base_floor = 0.55
     new_conf, updated_entry = compute_weighted_confidence(existing_entry, base_floor=base_floor, sources=sources)
 
     set_knowledge(topic, answer.strip(), confidence=new_conf, sources=sources, notes="Learned via /weblearn (Phase 2) (Phase 5.1 weighted confidence)", taught_by_user=False, _merge_evidence=updated_entry.get("evidence"))
     print(answer.strip())
 
-    okg, _whyg = autonomy_queue_guard_ok()
-    if okg:
-        queue_add(topic, reason="Learned via /weblearn (Phase 2) - deepen later", confidence=new_conf)
+    guard = QueueGuard()
+    if guard.ok() and queue_add(topic, reason="Learned via /weblearn (Phase 2) - deepen later",
+                                confidence=new_conf)[0]:
+        guard.note_added()
 
-    expansions = expand_topic_if_needed(topic)
-    for ex in expansions:
-        okg2, _ = autonomy_queue_guard_ok()
-        if okg2:
-            queue_add(ex, reason=f"Expanded from '{topic}'", confidence=0.35)
+    for expansion in expand_topic_if_needed(topic):
+        reason = f"Expanded from '{topic}'"
+        if guard.ok() and queue_add(expansion, reason=reason, confidence=0.35)[0]:
+            guard.note_added()
 
+@deferred_persistence()
 def cmd_weburl(arg: str) -> None:
     left, right = split_pipe(arg)
     topic = normalize_topic(left.replace("/weburl", "", 1).strip())
@@ -3648,18 +4538,18 @@ def cmd_weburl(arg: str) -> None:
 
     k = load_knowledge()
     existing = k.get(topic)
-    existing_entry = ensure_entry_shape(existing) if isinstance(existing, dict) else ensure_entry_shape({})
+    existing_entry = evidence_working_copy(existing)
     base_floor = 0.60
     new_conf, updated_entry = compute_weighted_confidence(existing_entry, base_floor=base_floor, sources=sources)
 
     set_knowledge(topic, answer.strip(), confidence=new_conf, sources=sources, notes="Learned via /weburl (Phase 2) (Phase 5.1 weighted confidence)", taught_by_user=False, _merge_evidence=updated_entry.get("evidence"))
     print(answer.strip())
 
-    expansions = expand_topic_if_needed(topic)
-    for ex in expansions:
-        okg, _ = autonomy_queue_guard_ok()
-        if okg:
-            queue_add(ex, reason=f"Expanded from '{topic}'", confidence=0.35)
+    guard = QueueGuard()
+    for expansion in expand_topic_if_needed(topic):
+        reason = f"Expanded from '{topic}'"
+        if guard.ok() and queue_add(expansion, reason=reason, confidence=0.35)[0]:
+            guard.note_added()
 
 def cmd_webqueue(arg: str) -> None:
     rest = arg.replace("/webqueue", "", 1).strip()
@@ -3981,6 +4871,67 @@ def run_cli_mode() -> bool:
     return False
 
 
+# Slash commands in the order main() has always tried them: the first prefix the line
+# starts with wins (so "/importfolder" before "/import", "/lowestdomains" before
+# "/lowest"). A trailing space means the command needs an argument. The flag says
+# whether the handler takes the raw input line.
+_COMMANDS: Tuple[Tuple[str, Any, bool], ...] = (
+    ("/teach ", cmd_teach, True),
+    ("/teachfile ", cmd_teachfile, True),
+    ("/ingest ", cmd_ingest, True),
+    ("/importfolder", cmd_importfolder, True),
+    ("/import", cmd_import, True),
+    ("/export", cmd_export, False),
+    ("/queuehealth", cmd_queuehealth, False),
+    ("/queue", cmd_queue, False),
+    ("/clearpending", cmd_clearpending, False),
+    ("/purgejunk", cmd_purgejunk, False),
+    ("/promote", cmd_promote, False),
+    ("/confidence", cmd_confidence, True),
+    ("/confirm", cmd_confirm, True),
+    ("/lowestdomains", cmd_lowestdomains, True),
+    ("/lowest", cmd_lowest, True),
+    ("/needsources", cmd_needsources, True),
+    ("/debugsources", cmd_debugsources, True),
+    ("/repair_evidence", cmd_repair_evidence, True),
+    ("/alias ", cmd_alias, True),
+    ("/aliases", cmd_aliases, False),
+    ("/unalias", cmd_unalias, True),
+    ("/why", cmd_why, True),
+    ("/accept", cmd_accept, False),
+    ("/suggest", cmd_suggest, False),
+    ("/weblearn", cmd_weblearn, True),
+    ("/weburl", cmd_weburl, True),
+    ("/webqueue", cmd_webqueue, True),
+    ("/curiosity", cmd_curiosity, True),
+    # Phase 3 commands
+    ("/merge", cmd_merge, True),
+    ("/dedupe", cmd_dedupe, True),
+    ("/prune", cmd_prune, True),
+    ("/clearcache", cmd_clearcache, False),
+    ("/selftest", cmd_selftest, True),
+    # Phase 4 command
+    ("/autonomy", cmd_autonomy, True),
+)
+
+# exact first-token lookup; no earlier prefix in _COMMANDS can shadow a whole command name
+_COMMAND_BY_NAME: Dict[str, Tuple[str, Any, bool]] = {c[0].rstrip(): c for c in _COMMANDS}
+
+def dispatch_command(user: str) -> bool:
+    """Run the slash command in user, if any. Returns False for an unknown command."""
+    cmd = _COMMAND_BY_NAME.get(user.split(None, 1)[0])
+    if cmd is None or not user.startswith(cmd[0]):
+        # glued or oddly spaced input ("/lowest5", "/teach<TAB>x"): same prefix scan as before
+        cmd = next((c for c in _COMMANDS if user.startswith(c[0])), None)
+        if cmd is None:
+            return False
+    _prefix, handler, takes_line = cmd
+    if takes_line:
+        handler(user)
+    else:
+        handler()
+    return True
+
 def main() -> None:
     # headless CLI mode (systemd)
     if run_cli_mode():
@@ -4032,82 +4983,8 @@ def main() -> None:
                     print(f"/forcerfc error: {_e}")
                 continue
 
-            if user.startswith("/teach "):
-                cmd_teach(user); continue
-            if user.startswith("/teachfile "):
-                cmd_teachfile(user); continue
-            if user.startswith("/ingest "):
-                cmd_ingest(user); continue
-            if user.startswith("/importfolder"):
-                cmd_importfolder(user); continue
-            if user.startswith("/import"):
-                cmd_import(user); continue
-            if user.startswith("/export"):
-                cmd_export(); continue
-            if user.startswith("/queuehealth"):
-                cmd_queuehealth(); continue
-            if user.startswith("/queue"):
-                cmd_queue(); continue
-            if user.startswith("/clearpending"):
-                cmd_clearpending(); continue
-            if user.startswith("/purgejunk"):
-                cmd_purgejunk(); continue
-            if user.startswith("/promote"):
-                cmd_promote(); continue
-            if user.startswith("/confidence"):
-                cmd_confidence(user); continue
-            if user.startswith("/confirm"):
-                cmd_confirm(user); continue
-            if user.startswith("/lowestdomains"):
-                cmd_lowestdomains(user); continue
-
-            if user.startswith("/lowest"):
-                cmd_lowest(user); continue
-            if user.startswith("/needsources"):
-                cmd_needsources(user); continue
-
-
-
-            if user.startswith("/debugsources"):
-                cmd_debugsources(user); continue
-
-            if user.startswith("/repair_evidence"):
-                cmd_repair_evidence(user); continue
-
-            if user.startswith("/alias "):
-                cmd_alias(user); continue
-            if user.startswith("/aliases"):
-                cmd_aliases(); continue
-            if user.startswith("/unalias"):
-                cmd_unalias(user); continue
-            if user.startswith("/why"):
-                cmd_why(user); continue
-            if user.startswith("/accept"):
-                cmd_accept(); continue
-            if user.startswith("/suggest"):
-                cmd_suggest(); continue
-            if user.startswith("/weblearn"):
-                cmd_weblearn(user); continue
-            if user.startswith("/weburl"):
-                cmd_weburl(user); continue
-            if user.startswith("/webqueue"):
-                cmd_webqueue(user); continue
-            if user.startswith("/curiosity"):
-                cmd_curiosity(user); continue
-
-            # Phase 3 commands
-            if user.startswith("/merge"):
-                cmd_merge(user); continue
-            if user.startswith("/dedupe"):
-                cmd_dedupe(user); continue
-            if user.startswith("/prune"):
-                cmd_prune(user); continue
-            if user.startswith("/selftest"):
-                cmd_selftest(user); continue
-
-            # Phase 4 command
-            if user.startswith("/autonomy"):
-                cmd_autonomy(user); continue
+            if dispatch_command(user):
+                continue
 
             print("Unknown command. Type /help.")
             continue
@@ -32,7 +32,7 @@ import json
 import os
 import sys
 import time
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Set
 
 from research_manager import ResearchManager, RESEARCH_QUEUE_PATH
 from memory_manager import normalize_question
@@ -106,12 +106,41 @@ SELF_STUDY_TOPICS: List[str] = [
 # Helpers
 # ---------------------------------------------------------------------------
 
+def _parse_chatlog_lines(text: str) -> List[Dict[str, Any]]:
+    """
+    Parse an append-only chat log: one JSON object per line.
+    Raises ValueError if any non-blank line is not a JSON object.
+    """
+    entries: List[Dict[str, Any]] = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        obj = json.loads(line)
+        if not isinstance(obj, dict):
+            raise ValueError("chatlog line is not a JSON object")
+        entries.append(obj)
+    return entries
+
+
 def _load_chatlog(path: str) -> List[Dict[str, Any]]:
+    """
+    Load the chat log. Accepts the classic single JSON list and the
+    line-delimited form (one entry per line), so a writer can append
+    entries instead of rewriting the whole file.
+    """
     if not os.path.exists(path):
         return []
     try:
         with open(path, "r", encoding="utf-8") as f:
-            obj = json.load(f)
+            text = f.read()
+        try:
+            obj = json.loads(text)
+        except json.JSONDecodeError:
+            return _parse_chatlog_lines(text)
+        if isinstance(obj, dict):
+            # a JSONL log holding a single entry
+            return [obj]
         return obj if isinstance(obj, list) else []
     except Exception as e:
         backup = f"{path}.corrupt_{int(time.time())}"
@@ -123,11 +152,12 @@ def _load_chatlog(path: str) -> List[Dict[str, Any]]:
         return []
 
 
-def _collect_existing_topic_keys(queue: List[Dict[str, Any]]) -> List[str]:
+def _collect_existing_topic_keys(queue: List[Dict[str, Any]]) -> Set[str]:
     """
-    Build a list of normalized question keys that are already queued as topics.
+    Build the set of normalized question keys that are already queued as topics.
+    A set keeps each "already queued?" check O(1) as the queue grows.
     """
-    keys: List[str] = []
+    keys: Set[str] = set()
     for entry in queue:
         if entry.get("type") != "topic":
             continue
@@ -135,15 +165,15 @@ def _collect_existing_topic_keys(queue: List[Dict[str, Any]]) -> List[str]:
         if not isinstance(q, str):
             continue
         norm = normalize_question(q)
-        if norm and norm not in keys:
-            keys.append(norm)
+        if norm:
+            keys.add(norm)
     return keys
 
 
 def _enqueue_chatlog_topics(
     mgr: ResearchManager,
     chatlog: List[Dict[str, Any]],
-    existing_topic_keys: List[str],
+    existing_topic_keys: Set[str],
 ) -> int:
     """
     From the chatlog, enqueue topics where needs_research == True.
@@ -174,7 +204,7 @@ def _enqueue_chatlog_topics(
                 reason="evolution_from_chatlog",
                 channel=channel,
             )
-            existing_topic_keys.append(norm_q)
+            existing_topic_keys.add(norm_q)
             added += 1
 
         except Exception as e:
@@ -185,7 +215,7 @@ def _enqueue_chatlog_topics(
 
 def _enqueue_self_study_topics(
     mgr: ResearchManager,
-    existing_topic_keys: List[str],
+    existing_topic_keys: Set[str],
 ) -> int:
     """
     Enqueue built-in self-study topics if they are not already in the queue.
@@ -204,7 +234,7 @@ def _enqueue_self_study_topics(
             reason="self_study",
             channel="self",
         )
-        existing_topic_keys.append(norm_q)
+        existing_topic_keys.add(norm_q)
         added += 1
 
     return added
@@ -20,6 +20,7 @@ Also exposes:
 """
 
 from __future__ import annotations
+import functools
 import json
 import os
 from typing import Any, Dict, Optional, Tuple, List
@@ -69,6 +70,7 @@ def _strip_leading_markers(text: str) -> str:
     return t
 
 
+@functools.lru_cache(maxsize=4096)
 def normalize_question(text: str) -> str:
     """
     Shared normalization for questions:
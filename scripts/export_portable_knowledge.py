@@ -38,6 +38,11 @@ def entries_to_dict(entries):
     for topic, entry in entries:
         e = dict(entry)
         e.pop("topic", None)
+        # brain.py's internal shaping markers don't belong in a portable file
+        e.pop("_schema_v", None)
+        e.pop("_dcount", None)
+        if isinstance(e.get("evidence"), dict):
+            e["evidence"] = {f: v for f, v in e["evidence"].items() if f != "_evs_v"}
         out[topic] = e
     return out
 
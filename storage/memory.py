@@ -2,9 +2,14 @@ from __future__ import annotations
 import json
 import os
 import time
-import tempfile
 import fcntl
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
+
+# Optional fast JSON (falls back to stdlib json)
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
 
 # Canonical memory location (overridable)
 MEMORY_FILE = os.getenv(
@@ -50,32 +55,62 @@ def _coerce_mem(obj: Any) -> Dict[str, Any]:
     return _default_mem()
 
 
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # orjson.JSONEncodeError subclasses TypeError
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            pass  # orjson.JSONDecodeError subclasses ValueError (NaN etc. fall back)
+    return json.loads(data)
+
+
 def _load_unlocked() -> Dict[str, Any]:
     if not os.path.exists(MEMORY_FILE):
         return _default_mem()
     try:
-        with open(MEMORY_FILE, "r", encoding="utf-8") as fh:
-            return _coerce_mem(json.load(fh))
+        with open(MEMORY_FILE, "rb") as fh:
+            return _coerce_mem(_loads(fh.read()))
     except Exception:
         return _default_mem()
 
 
+_ENSURED_DIRS: Set[str] = set()
+
+
+def _ensure_mem_dir() -> None:
+    # every locked call and every save used to hit makedirs; once per directory is enough
+    d = os.path.dirname(MEMORY_FILE)
+    if d not in _ENSURED_DIRS:
+        os.makedirs(d, exist_ok=True)
+        _ENSURED_DIRS.add(d)
+
+
+def _atomic_write_bytes(path: str, data: bytes) -> None:
+    # callers hold LOCK_FILE, so a fixed sibling tmp name can't collide
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
 def _save_unlocked(mem: Dict[str, Any]) -> None:
-    os.makedirs(os.path.dirname(MEMORY_FILE), exist_ok=True)
-    data = json.dumps(_coerce_mem(mem), indent=2, ensure_ascii=False)
-    with tempfile.NamedTemporaryFile(
-        "w", encoding="utf-8",
-        dir=os.path.dirname(MEMORY_FILE),
-        delete=False,
-    ) as tf:
-        tf.write(data)
-        tmp = tf.name
-    os.replace(tmp, MEMORY_FILE)
+    _ensure_mem_dir()
+    # every message/note rewrites the whole file, so keep the encode step cheap
+    _atomic_write_bytes(MEMORY_FILE, _dumps(_coerce_mem(mem)))
 
 
 def _with_lock(fn):
     def wrapper(*args, **kwargs):
-        os.makedirs(os.path.dirname(MEMORY_FILE), exist_ok=True)
+        _ensure_mem_dir()
         with open(LOCK_FILE, "w") as lf:
             fcntl.flock(lf, fcntl.LOCK_EX)
             try:
@@ -0,0 +1,25 @@
+"""
+Shared fixtures. brain.py keeps its stores under BASE_DIR/data, so each test imports
+its own copy of the module from a temp dir and never touches the real data/.
+"""
+
+import importlib
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def brain(tmp_path, monkeypatch):
+    shutil.copy(REPO_DIR / "brain.py", tmp_path / "brain.py")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    # drop any copy a previous test imported
+    monkeypatch.delitem(sys.modules, "brain", raising=False)
+    mod = importlib.import_module("brain")
+    mod.ensure_dirs()
+    mod.atomic_write_json(mod.KNOWLEDGE_PATH, {})
+    return mod
@@ -0,0 +1,34 @@
+def test_same_size_key_swap_rebuilds_index(brain):
+    k = {"dns": {}, "bgp routing": {}}
+    assert brain.suggest_alias("bgp routin", k, {}) == "bgp routing"
+
+    # same dict object, same length, different keys
+    del k["bgp routing"]
+    k["ospf routing"] = {}
+    assert brain.suggest_alias("ospf routin", k, {}) == "ospf routing"
+
+
+def test_saved_prune_then_learn_is_visible(brain):
+    brain.set_knowledge("dns", "Domain Name System", 0.5)
+    brain.set_knowledge("bgp routing", "Border Gateway Protocol", 0.5)
+    assert (
+        brain.suggest_alias("bgp routin", brain.load_knowledge(), {}) == "bgp routing"
+    )
+
+    k = brain.load_knowledge()
+    del k["bgp routing"]
+    brain.save_knowledge(k)
+    brain.set_knowledge("ospf routing", "Open Shortest Path First", 0.5)
+
+    assert (
+        brain.suggest_alias("ospf routin", brain.load_knowledge(), {}) == "ospf routing"
+    )
+
+
+def test_reordered_keys_keep_first_match_in_store_order(brain):
+    k = {"tcp handshake": {}, "tcp header": {}}
+    assert brain.suggest_alias("tcp", k, {}) == "tcp handshake"
+
+    k.pop("tcp handshake")
+    k["tcp handshake"] = {}
+    assert brain.suggest_alias("tcp", k, {}) == "tcp header"
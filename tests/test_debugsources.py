@@ -0,0 +1,31 @@
+import re
+import time
+
+URLS = [
+    "https://en.wikipedia.org/wiki/Border_Gateway_Protocol",
+    "https://www.rfc-editor.org/rfc/rfc4271",
+    "https://example.com/bgp-basics",
+    "https://www.cisco.com/c/en/us/support/docs/ip/border-gateway-protocol-bgp/index.html",
+    "https://blog.example.net/bgp",
+]
+
+
+def test_rows_stay_in_score_order(brain, monkeypatch, capsys):
+    def fake_results(q, max_results=12):
+        return [{"url": u, "title": "BGP"} for u in URLS]
+
+    def fake_fetch(url):
+        # the best-scored pages come back last
+        time.sleep(0.02 * (5 - URLS.index(url)))
+        return True, " word" * (URLS.index(url) + 1), "ok"
+
+    monkeypatch.setattr(brain, "ddg_html_results", fake_results)
+    monkeypatch.setattr(brain, "fetch_page_text_debug", fake_fetch)
+    brain.cmd_debugsources("/debugsources bgp")
+
+    expected = sorted(URLS, key=lambda u: brain.source_score(u, "BGP"), reverse=True)
+    rows = re.findall(r"len=\s*(\d+) domain=\S+ url=(\S+)", capsys.readouterr().out)
+    assert [u for _n, u in rows] == expected * 2
+    for n, u in rows:
+        words = URLS.index(u) + 1
+        assert int(n) == len(" ".join(["word"] * words))
@@ -0,0 +1,28 @@
+def _dedupe(brain, capsys):
+    capsys.readouterr()
+    brain.cmd_dedupe("/dedupe")
+    return capsys.readouterr().out
+
+
+def test_groups_identical_answers(brain, capsys):
+    brain.set_knowledge("dns", "Domain Name System", 0.5)
+    brain.set_knowledge("domain name system", "Domain Name System", 0.5)
+    brain.set_knowledge("tcp", "Transmission Control Protocol", 0.5)
+    out = _dedupe(brain, capsys)
+    assert "Duplicate group (2 topics). Suggested keep: 'dns'" in out
+    assert "/merge domain name system | dns" in out
+    assert "tcp" not in out
+
+
+def test_sees_writes_from_any_writer(brain, capsys):
+    brain.set_knowledge("dns", "Domain Name System", 0.5)
+    brain.set_knowledge("tcp", "Transmission Control Protocol", 0.5)
+    assert "No exact duplicate answers found." in _dedupe(brain, capsys)
+
+    k = brain.load_knowledge()
+    k["tcp"]["answer"] = "Domain Name System"
+    brain.save_knowledge(k)
+    assert "/merge tcp | dns" in _dedupe(brain, capsys)
+
+    brain.set_knowledge("tcp", "Transmission Control Protocol", 0.5)
+    assert "No exact duplicate answers found." in _dedupe(brain, capsys)
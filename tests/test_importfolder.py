@@ -0,0 +1,29 @@
+import json
+
+
+def _write_folder(tmp_path):
+    folder = tmp_path / "imports"
+    folder.mkdir()
+    for i in range(5):
+        (folder / f"part{i}.json").write_text(
+            json.dumps({"shared": f"answer {i}", f"topic {i}": f"only {i}"})
+        )
+    (folder / "part2.json").write_text("{not json")
+    (folder / "notes.txt").write_text("{}")
+    return folder
+
+
+def test_importfolder_later_files_win(brain, tmp_path, capsys):
+    folder = _write_folder(tmp_path)
+    brain.cmd_importfolder(f"/importfolder {folder}")
+    # part2.json is invalid and skipped; notes.txt isn't a .json file
+    assert "Imported 4 JSON files." in capsys.readouterr().out
+
+    k = brain.load_knowledge()
+    assert k["shared"]["answer"] == "answer 4"
+    assert sorted(t for t in k if t.startswith("topic")) == [
+        "topic 0",
+        "topic 1",
+        "topic 3",
+        "topic 4",
+    ]
@@ -0,0 +1,34 @@
+import json
+import os
+
+
+def _replace_same_size(path, obj, mtime_ns):
+    # another process's atomic save: same size, same mtime tick, new inode
+    tmp = path + ".other"
+    with open(tmp, "w") as f:
+        json.dump(obj, f)
+    os.replace(tmp, path)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_same_size_rewrite_in_one_tick_is_reloaded(brain):
+    path = os.path.join(brain.DATA_DIR, "aliases.json")
+    with open(path, "w") as f:
+        json.dump({"dns": "domain name system"}, f)
+    mtime_ns = os.stat(path).st_mtime_ns
+    assert brain.read_json_cached(path, {}) == {"dns": "domain name system"}
+
+    keep = open(path)  # hold the old inode so it can't be reused
+    try:
+        _replace_same_size(path, {"dns": "domain_name_system"}, mtime_ns)
+        assert os.stat(path).st_size == os.fstat(keep.fileno()).st_size
+        assert brain.read_json_cached(path, {}) == {"dns": "domain_name_system"}
+    finally:
+        keep.close()
+
+
+def test_unchanged_file_is_served_from_cache(brain):
+    path = os.path.join(brain.DATA_DIR, "aliases.json")
+    brain.atomic_write_json(path, {"dns": "domain name system"})
+    first = brain.read_json_cached(path, {})
+    assert brain.read_json_cached(path, {}) is first
@@ -0,0 +1,51 @@
+def _expected(brain, n=10):
+    k = brain.load_knowledge()
+    rows = sorted(
+        ((float(e.get("confidence", 0.0)), t) for t, e in k.items()), key=lambda r: r[0]
+    )
+    return [f"Lowest confidence (top {n}):"] + [f"- {t}: {c}" for c, t in rows[:n]]
+
+
+def _lowest(brain, capsys, arg="/lowest"):
+    capsys.readouterr()
+    brain.cmd_lowest(arg)
+    return capsys.readouterr().out.splitlines()
+
+
+def test_lowest_follows_confidence_then_store_order(brain, capsys):
+    for topic, conf in [
+        ("dns", 0.5),
+        ("tcp", 0.3),
+        ("udp", 0.5),
+        ("bgp", 0.3),
+        ("ospf", 0.4),
+    ]:
+        brain.set_knowledge(topic, f"{topic} answer", conf)
+    assert _lowest(brain, capsys) == _expected(brain)
+
+    # patched in place: an existing topic moves, a new one joins a tie at the end
+    brain.set_knowledge("tcp", "tcp answer", 0.45)
+    brain.set_knowledge("arp", "arp answer", 0.3)
+    assert _lowest(brain, capsys) == _expected(brain)
+    assert _lowest(brain, capsys, "/lowest 2") == _expected(brain, 2)
+
+
+def test_lowest_rebuilds_after_other_writers(brain, capsys):
+    for topic, conf in [("dns", 0.5), ("tcp", 0.3), ("udp", 0.4)]:
+        brain.set_knowledge(topic, f"{topic} answer", conf)
+    assert _lowest(brain, capsys) == _expected(brain)
+
+    k = brain.load_knowledge()
+    k["dns"]["confidence"] = 0.1
+    k = {t: k[t] for t in ("udp", "dns", "tcp")}
+    brain.save_knowledge(k)
+    assert _lowest(brain, capsys) == _expected(brain)
+
+    brain.set_knowledge("icmp", "icmp answer", 0.1)
+    assert _lowest(brain, capsys) == _expected(brain)
+
+
+def test_negative_count_uses_default(brain, capsys):
+    for i in range(12):
+        brain.set_knowledge(f"topic {i}", "answer", 0.5)
+    assert _lowest(brain, capsys, "/lowest -3") == _expected(brain)
@@ -0,0 +1,38 @@
+def test_evidence_after_merge_counts_merged_sources(brain):
+    brain.set_knowledge(
+        "alpha", "first answer", 0.5, sources=["https://www.ietf.org/rfc/rfc791"]
+    )
+    brain.set_knowledge("beta", "second answer", 0.5, sources=["https://nist.gov/itl"])
+    brain.cmd_merge("beta | alpha")
+
+    # /merge adds beta's source to alpha without touching evidence_domains
+    assert brain.load_knowledge()["alpha"]["sources"] == [
+        "https://www.ietf.org/rfc/rfc791",
+        "https://nist.gov/itl",
+    ]
+
+    brain.set_knowledge(
+        "alpha",
+        "first answer",
+        0.5,
+        sources=["https://docs.python.org/3/library/socket.html"],
+    )
+    e = brain.load_knowledge()["alpha"]
+    assert e["evidence_domains"] == ["ietf.org", "nist.gov", "docs.python.org"]
+    assert e["evidence_buckets"] == {"rfc": 1, "gov_edu": 1, "vendor": 1}
+    assert e["_dcount"] == 3
+
+
+def test_evidence_matches_full_recount(brain):
+    srcs = [
+        "https://en.wikipedia.org/wiki/DNS",
+        "https://www.rfc-editor.org/rfc/rfc1035",
+    ]
+    brain.set_knowledge("dns", "Domain Name System", 0.5, sources=srcs[:1])
+    brain.set_knowledge("dns", "Domain Name System", 0.5, sources=srcs[1:])
+    brain.set_knowledge("dns", "Domain Name System", 0.5, sources=srcs)
+
+    e = brain.load_knowledge()["dns"]
+    assert e["sources"] == srcs
+    assert e["evidence_domains"] == ["en.wikipedia.org", "rfc-editor.org"]
+    assert e["evidence_buckets"] == {"wiki": 1, "rfc": 1}
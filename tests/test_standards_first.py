@@ -0,0 +1,50 @@
+import threading
+
+
+def _fake_search(brain, monkeypatch, hits):
+    queries = []
+    lock = threading.Lock()
+
+    def fake(query, max_results=12):
+        with lock:
+            queries.append(query)
+        site = query.split()[0].removeprefix("site:")
+        url = hits.get(site)
+        return [{"url": url, "title": "bgp"}] if url else []
+
+    monkeypatch.setattr(brain, "ddg_html_results", fake)
+    monkeypatch.setattr(brain, "choose_preferred_source", lambda c: c[0])
+    return queries
+
+
+def test_rfc_editor_hit_is_the_only_search(brain, monkeypatch):
+    queries = _fake_search(
+        brain,
+        monkeypatch,
+        {"rfc-editor.org": "https://www.rfc-editor.org/rfc/rfc4271", "ietf.org": "x"},
+    )
+    assert brain.try_standards_first("bgp") == (
+        "https://www.rfc-editor.org/rfc/rfc4271",
+        "rfc-editor.org",
+    )
+    assert queries == ["site:rfc-editor.org bgp"]
+
+
+def test_miss_falls_back_in_preference_order(brain, monkeypatch):
+    queries = _fake_search(
+        brain,
+        monkeypatch,
+        {"ietf.org": "https://datatracker.ietf.org/doc/rfc4271", "nist.gov": "y"},
+    )
+    assert brain.try_standards_first("bgp") == (
+        "https://datatracker.ietf.org/doc/rfc4271",
+        "ietf.org",
+    )
+    assert queries[0] == "site:rfc-editor.org bgp"
+    assert sorted(queries[1:]) == ["site:ietf.org bgp", "site:nist.gov bgp"]
+
+    _fake_search(brain, monkeypatch, {"nist.gov": "https://csrc.nist.gov/bgp"})
+    assert brain.try_standards_first("bgp") == ("https://csrc.nist.gov/bgp", "nist.gov")
+
+    _fake_search(brain, monkeypatch, {})
+    assert brain.try_standards_first("bgp") is None
@@ -0,0 +1,97 @@
+import os
+
+
+def _counted(brain, ttl, **opts):
+    calls = []
+
+    @brain.ttl_cache(os.path.join(brain.DATA_DIR, "test_cache.json"), ttl, **opts)
+    def lookup(q, n=2):
+        calls.append((q, n))
+        return None if q == "missing" else [q] * n
+
+    return lookup, calls
+
+
+def test_hit_until_ttl_then_refetch(brain, monkeypatch):
+    clock = [1000]
+    monkeypatch.setattr(brain, "now_ts", lambda: clock[0])
+    lookup, calls = _counted(brain, 60)
+
+    assert lookup("dns") == ["dns", "dns"]
+    clock[0] += 59
+    assert lookup("dns", n=2) == ["dns", "dns"]
+    assert calls == [("dns", 2)]
+
+    clock[0] += 1
+    assert lookup("dns") == ["dns", "dns"]
+    assert calls == [("dns", 2), ("dns", 2)]
+
+
+def test_rejected_results_are_not_cached(brain, monkeypatch):
+    monkeypatch.setattr(brain, "now_ts", lambda: 1000)
+    lookup, calls = _counted(brain, 60)
+    lookup("missing")
+    lookup("missing")
+    assert calls == [("missing", 2), ("missing", 2)]
+
+    lookup, calls = _counted(
+        brain, 60, keep=lambda v: v and v[0] != "skip", restore=tuple
+    )
+    assert lookup("skip") == ["skip", "skip"]
+    assert lookup("skip") == ["skip", "skip"]
+    assert lookup("tcp") == ["tcp", "tcp"]
+    # hits come back through restore()
+    assert lookup("tcp") == ("tcp", "tcp")
+    assert calls == [("skip", 2), ("skip", 2), ("tcp", 2)]
+
+
+def test_expired_entries_dropped_on_rewrite(brain, monkeypatch):
+    clock = [1000]
+    monkeypatch.setattr(brain, "now_ts", lambda: clock[0])
+    lookup, _calls = _counted(brain, 60)
+    lookup("dns")
+    clock[0] += 120
+    lookup("tcp")
+
+    cache = brain.read_json(os.path.join(brain.DATA_DIR, "test_cache.json"), {})
+    assert [k.split("|")[1] for k in cache] == ['["tcp", 2]']
+
+
+def test_deferred_batch_writes_cache_once(brain, monkeypatch):
+    path = os.path.join(brain.DATA_DIR, "test_cache.json")
+    writes = []
+    real_write = brain.atomic_write_json
+
+    def counting_write(p, obj, *a, **kw):
+        if p == path:
+            writes.append(len(obj))
+        return real_write(p, obj, *a, **kw)
+
+    monkeypatch.setattr(brain, "atomic_write_json", counting_write)
+    lookup, calls = _counted(brain, 60)
+    with brain.deferred_persistence():
+        for q in ("dns", "tcp", "udp"):
+            lookup(q)
+        assert writes == []
+        # still served from the pending batch
+        lookup("dns")
+    assert len(calls) == 3
+    assert writes == [3]
+
+
+def test_clearcache_drops_file_and_pending_batch(brain, monkeypatch, capsys):
+    monkeypatch.setattr(
+        brain, "WEB_CACHE_PATH", os.path.join(brain.DATA_DIR, "test_cache.json")
+    )
+    lookup, calls = _counted(brain, 60)
+    lookup("dns")
+    assert os.path.exists(brain.WEB_CACHE_PATH)
+
+    with brain.deferred_persistence():
+        lookup("tcp")
+        brain.cmd_clearcache()
+    assert "Cleared" in capsys.readouterr().out
+    assert not os.path.exists(brain.WEB_CACHE_PATH)
+
+    lookup("dns")
+    assert calls == [("dns", 2), ("tcp", 2), ("dns", 2)]
@@ -0,0 +1,38 @@
+import time
+
+TOPICS = ["dns resolution", "tcp handshake", "bgp routing"]
+
+
+def test_results_applied_in_queue_order(brain, monkeypatch):
+    for t in TOPICS:
+        ok, msg = brain.queue_add(t, reason="test")
+        assert ok, msg
+
+    # the first topic's fetch finishes last
+    delays = dict(zip(TOPICS, (0.2, 0.1, 0.0)))
+
+    def fake_learn(topic, forced_url="", avoid_domains=None):
+        time.sleep(delays[topic])
+        url = "https://docs.example.org/" + topic.replace(" ", "-")
+        return True, f"About {topic}.", [url], url
+
+    applied = []
+    real_set = brain.set_knowledge
+
+    def recording_set(topic, *a, **kw):
+        applied.append(topic)
+        return real_set(topic, *a, **kw)
+
+    monkeypatch.setattr(brain, "web_learn_topic", fake_learn)
+    monkeypatch.setattr(brain, "expand_topic_if_needed", lambda _t: [])
+    monkeypatch.setattr(brain, "set_knowledge", recording_set)
+
+    brain.run_webqueue(limit=3)
+
+    assert applied == TOPICS
+    k = brain.load_knowledge()
+    for item in brain.load_queue():
+        t = item["topic"]
+        assert item["status"] == "done"
+        assert item["source_url"] == "https://docs.example.org/" + t.replace(" ", "-")
+        assert k[t]["answer"] == f"About {t}."